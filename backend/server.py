@@ -1,23 +1,322 @@
-from fastapi import FastAPI, APIRouter, HTTPException
+from fastapi import FastAPI, APIRouter, HTTPException, Query, Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from dotenv import load_dotenv
+from starlette.datastructures import Headers, MutableHeaders
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ASCENDING, TEXT, DeleteOne, IndexModel, InsertOne, ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError, OperationFailure, PyMongoError
+from pymongo.monitoring import CommandListener, ConnectionPoolListener
+from pymongo.read_preferences import Nearest, Primary, PrimaryPreferred, Secondary, SecondaryPreferred
 import os
+import asyncio
+import json
+import base64
+import codecs
+import csv
+import io
+import hashlib
+import html
+import re
+import zlib
 import logging
+import threading
+from collections import OrderedDict
+from functools import lru_cache, partial
 from pathlib import Path
-from pydantic import BaseModel, Field
-from typing import List, Optional
+from pydantic import BaseModel, Field, ValidationError, conint
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
 import uuid
-from datetime import datetime, date, time
+from time import monotonic
+from datetime import datetime, date, time, timedelta, timezone
 from enum import Enum
+import numpy as np
+import orjson
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; responses fall back to gzip
+    brotli = None
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
+# Metrics
+# A small Prometheus-compatible registry: counters, gauges and histograms with labels,
+# rendered in the text exposition format at /metrics. Mongo command timings and
+# result sizes come from a CommandListener; HTTP timings from MetricsMiddleware.
+# Values live in the serving process and are not shared between workers. Run one worker
+# per scrape target; with several, each sample carries a worker label (METRICS_WORKER_ID
+# or the pid) so series from different processes are told apart rather than mixed, and
+# aggregate across workers in the query (sum without (worker)).
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DOCUMENT_COUNT_BUCKETS = (0, 1, 10, 100, 500, 1000, 5000, 10000)
+
+def escape_label(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def format_labels(labels: tuple) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{escape_label(value)}"' for name, value in labels) + "}"
+
+class Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, description: str, collect: Optional[Callable[[], dict]] = None):
+        self.name = name
+        self.description = description
+        # collect() returns {labels tuple: value} and is read at scrape time
+        self.collect = collect
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def samples(self) -> List[Tuple[str, tuple, float]]:
+        if self.collect:
+            return [(self.name, labels, value) for labels, value in self.collect().items()]
+        with self._lock:
+            return [(self.name, labels, value) for labels, value in self._values.items()]
+
+    def render(self, const_labels: tuple = ()) -> List[str]:
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} {self.kind}"]
+        lines += [f"{name}{format_labels(const_labels + labels)} {value}" for name, labels, value in self.samples()]
+        return lines
+
+    def inc(self, amount: float = 1, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+class Counter(Metric):
+    kind = "counter"
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, description: str, buckets=LATENCY_BUCKETS):
+        super().__init__(name, description)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            counts, total, count = self._values.get(key, ([0] * len(self.buckets), 0.0, 0))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+            self._values[key] = (counts, total + value, count + 1)
+
+    def samples(self):
+        samples = []
+        with self._lock:
+            for key, (counts, total, count) in self._values.items():
+                for bound, bucket_count in zip(self.buckets, counts):
+                    samples.append((f"{self.name}_bucket", key + (("le", repr(float(bound))),), bucket_count))
+                samples.append((f"{self.name}_bucket", key + (("le", "+Inf"),), count))
+                samples.append((f"{self.name}_sum", key, total))
+                samples.append((f"{self.name}_count", key, count))
+        return samples
+
+class MetricsRegistry:
+    def __init__(self):
+        self.metrics: List[Metric] = []
+
+    def register(self, metric: Metric) -> Metric:
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        # Read at scrape time: a pid taken at import would be the parent's under a forking server
+        worker = (("worker", os.environ.get("METRICS_WORKER_ID") or str(os.getpid())),)
+        return "\n".join(line for metric in self.metrics for line in metric.render(worker)) + "\n"
+
+metrics = MetricsRegistry()
+http_requests_in_flight = metrics.register(Gauge("http_requests_in_flight", "HTTP requests currently being served."))
+http_request_duration = metrics.register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template, method and status."
+))
+mongo_command_duration = metrics.register(Histogram(
+    "mongodb_command_duration_seconds", "MongoDB command latency by command and collection."
+))
+mongo_documents_returned = metrics.register(Histogram(
+    "mongodb_documents_returned", "Documents returned per find/aggregate/getMore batch.", DOCUMENT_COUNT_BUCKETS
+))
+mongo_command_failures = metrics.register(Counter(
+    "mongodb_command_failures_total", "Failed MongoDB commands by command and collection."
+))
+
+class CommandMetrics(CommandListener):
+    """Times every Mongo command and counts the documents each read returns."""
+
+    RESULT_BATCHES = {"find": "firstBatch", "aggregate": "firstBatch", "getMore": "nextBatch"}
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = {}
+
+    def started(self, event):
+        command = event.command
+        collection = command.get("collection") if event.command_name == "getMore" else command.get(event.command_name)
+        with self._lock:
+            self._pending[(event.connection_id, event.request_id)] = (
+                event.command_name, collection if isinstance(collection, str) else ""
+            )
+
+    def _finish(self, event) -> Tuple[str, str]:
+        with self._lock:
+            name, collection = self._pending.pop((event.connection_id, event.request_id), (event.command_name, ""))
+        mongo_command_duration.observe(event.duration_micros / 1e6, command=name, collection=collection)
+        return name, collection
+
+    def succeeded(self, event):
+        name, collection = self._finish(event)
+        batch = self.RESULT_BATCHES.get(name)
+        if batch and isinstance(event.reply.get("cursor"), dict):
+            mongo_documents_returned.observe(
+                len(event.reply["cursor"].get(batch, ())), command=name, collection=collection
+            )
+
+    def failed(self, event):
+        name, collection = self._finish(event)
+        mongo_command_failures.inc(command=name, collection=collection)
+
 # MongoDB connection
+# Pool sizing, timeouts, wire compression and the default read preference are read from
+# MONGO_* variables; anything unset keeps the driver default. The client connects lazily
+# on first use, so building it at import never blocks and is safe across worker forks.
+# Calendar, analytics and search reads go through reporting_db, whose read preference
+# can send them to secondaries. That trades freshness (replication lag) for offloading
+# the primary, so it defaults to the primary.
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
+MONGO_CLIENT_OPTIONS = {
+    'MONGO_MAX_POOL_SIZE': ('maxPoolSize', int),
+    'MONGO_MIN_POOL_SIZE': ('minPoolSize', int),
+    'MONGO_MAX_IDLE_TIME_MS': ('maxIdleTimeMS', int),
+    'MONGO_MAX_CONNECTING': ('maxConnecting', int),
+    'MONGO_WAIT_QUEUE_TIMEOUT_MS': ('waitQueueTimeoutMS', int),
+    'MONGO_SERVER_SELECTION_TIMEOUT_MS': ('serverSelectionTimeoutMS', int),
+    'MONGO_CONNECT_TIMEOUT_MS': ('connectTimeoutMS', int),
+    'MONGO_SOCKET_TIMEOUT_MS': ('socketTimeoutMS', int),
+    'MONGO_COMPRESSORS': ('compressors', str),  # e.g. "zstd,snappy,zlib"
+    'MONGO_READ_PREFERENCE': ('readPreference', str),
+}
+MONGO_REPORTING_READ_PREFERENCE = os.environ.get('MONGO_REPORTING_READ_PREFERENCE', 'primary')
+MONGO_REPORTING_MAX_STALENESS_SECONDS = int(os.environ.get('MONGO_REPORTING_MAX_STALENESS_SECONDS', '-1'))
+
+class PoolStats(ConnectionPoolListener):
+    """Connection pool utilization and wait-queue figures per server, from pool events."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._servers = {}
+
+    def _server(self, address) -> dict:
+        key = "%s:%s" % address
+        if key not in self._servers:
+            self._servers[key] = {
+                "open": 0, "in_use": 0, "waiting": 0, "checkouts": 0,
+                "checkout_failures": {}, "total_wait_ms": 0.0, "max_wait_ms": 0.0, "pool_clears": 0,
+            }
+        return self._servers[key]
+
+    def connection_check_out_started(self, event):
+        # Started and checked-out events for one checkout fire on the same thread
+        self._local.started = monotonic()
+        with self._lock:
+            self._server(event.address)["waiting"] += 1
+
+    def connection_checked_out(self, event):
+        wait_ms = (monotonic() - getattr(self._local, "started", monotonic())) * 1000
+        with self._lock:
+            server = self._server(event.address)
+            server["waiting"] -= 1
+            server["in_use"] += 1
+            server["checkouts"] += 1
+            server["total_wait_ms"] += wait_ms
+            server["max_wait_ms"] = max(server["max_wait_ms"], wait_ms)
+
+    def connection_check_out_failed(self, event):
+        with self._lock:
+            server = self._server(event.address)
+            server["waiting"] -= 1
+            server["checkout_failures"][event.reason] = server["checkout_failures"].get(event.reason, 0) + 1
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            self._server(event.address)["in_use"] -= 1
+
+    def connection_created(self, event):
+        with self._lock:
+            self._server(event.address)["open"] += 1
+
+    def connection_closed(self, event):
+        with self._lock:
+            self._server(event.address)["open"] -= 1
+
+    def pool_cleared(self, event):
+        with self._lock:
+            self._server(event.address)["pool_clears"] += 1
+
+    def connection_ready(self, event):
+        pass
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def stats(self, max_pool_size: int) -> dict:
+        with self._lock:
+            servers = {}
+            for key, server in self._servers.items():
+                servers[key] = {
+                    **server,
+                    "checkout_failures": dict(server["checkout_failures"]),
+                    "available": server["open"] - server["in_use"],
+                    "utilization": server["in_use"] / max_pool_size if max_pool_size else None,
+                    "avg_wait_ms": server["total_wait_ms"] / server["checkouts"] if server["checkouts"] else 0.0,
+                }
+        return servers
+
+def mongo_client_options() -> dict:
+    options = {"connect": False, "event_listeners": [pool_stats, command_metrics]}
+    for variable, (option, cast) in MONGO_CLIENT_OPTIONS.items():
+        if os.environ.get(variable):
+            options[option] = cast(os.environ[variable])
+    return options
+
+def read_preference(mode: str, max_staleness: int = -1):
+    modes = {
+        "primary": Primary,
+        "primaryPreferred": PrimaryPreferred,
+        "secondary": Secondary,
+        "secondaryPreferred": SecondaryPreferred,
+        "nearest": Nearest,
+    }
+    if mode not in modes:
+        raise ValueError(f"Unknown read preference {mode!r}")
+    return Primary() if mode == "primary" else modes[mode](max_staleness=max_staleness)
+
+pool_stats = PoolStats()
+command_metrics = CommandMetrics()
+client = AsyncIOMotorClient(mongo_url, **mongo_client_options())
 db = client[os.environ['DB_NAME']]
+reporting_db = client.get_database(
+    os.environ['DB_NAME'],
+    read_preference=read_preference(MONGO_REPORTING_READ_PREFERENCE, MONGO_REPORTING_MAX_STALENESS_SECONDS),
+)
 
 # Create the main app without a prefix
 app = FastAPI()
@@ -43,7 +342,63 @@ class SprintStatus(str, Enum):
     ACTIVE = "active"
     COMPLETED = "completed"
 
+class JobStatus(str, Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+class RecurrenceFrequency(str, Enum):
+    DAILY = "daily"
+    WEEKLY = "weekly"
+    MONTHLY = "monthly"
+
+# Date storage
+# BSON has no date-only type, so calendar dates (due_date, start_date, end_date) are
+# stored as midnight UTC datetimes. That keeps range queries, indexes and date
+# aggregations native; responses still render them as YYYY-MM-DD.
+DATE_ONLY_FIELDS = ("due_date", "start_date", "end_date")
+
+def to_bson_date(value):
+    if isinstance(value, str):
+        value = date.fromisoformat(value[:10])
+    if isinstance(value, date) and not isinstance(value, datetime):
+        return datetime.combine(value, time.min)
+    return value
+
+def stored_date(value):
+    # Legacy documents may hold ISO strings; anything unparseable reads as no date (the migration keeps it)
+    try:
+        return to_bson_date(value) if value else None
+    except ValueError:
+        logger.warning("Ignoring unparseable stored date %r", value)
+        return None
+
+def as_date(value):
+    return value.date() if isinstance(value, datetime) else value
+
 # Models
+MAX_RECURRENCE_COUNT = 1000
+
+class Recurrence(BaseModel):
+    # RRULE-style rule; the task's due_date is the first occurrence (DTSTART)
+    frequency: RecurrenceFrequency
+    interval: int = Field(1, ge=1, le=366)
+    by_weekday: Optional[List[conint(ge=0, le=6)]] = None  # weekly only: 0 = Monday .. 6 = Sunday
+    until: Optional[date] = None  # inclusive
+    count: Optional[int] = Field(None, ge=1, le=MAX_RECURRENCE_COUNT)
+    exceptions: List[date] = []  # occurrence dates removed from the series (EXDATE)
+
+def recurrence_document(recurrence: Optional[dict]) -> Optional[dict]:
+    if not recurrence:
+        return recurrence
+    return {
+        **recurrence,
+        "frequency": RecurrenceFrequency(recurrence["frequency"]).value,
+        "until": to_bson_date(recurrence.get("until")),
+        "exceptions": [to_bson_date(day) for day in recurrence.get("exceptions") or []],
+    }
+
 class Task(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     title: str
@@ -57,6 +412,7 @@ class Task(BaseModel):
     created_date: datetime = Field(default_factory=datetime.utcnow)
     updated_date: datetime = Field(default_factory=datetime.utcnow)
     story_points: Optional[int] = None
+    recurrence: Optional[Recurrence] = None
     
     class Config:
         json_encoders = {
@@ -66,9 +422,19 @@ class Task(BaseModel):
     def dict(self, *args, **kwargs):
         d = super().dict(*args, **kwargs)
         if d.get('due_date'):
-            d['due_date'] = d['due_date'].isoformat() if isinstance(d['due_date'], date) else d['due_date']
+            d['due_date'] = to_bson_date(d['due_date'])
+        if d.get('recurrence'):
+            d['recurrence'] = recurrence_document(d['recurrence'])
         return d
 
+# Stored alongside priority so tasks can be sorted by urgency through an index
+PRIORITY_RANK = {
+    TaskPriority.LOW.value: 0,
+    TaskPriority.MEDIUM.value: 1,
+    TaskPriority.HIGH.value: 2,
+    TaskPriority.URGENT.value: 3,
+}
+
 class TaskCreate(BaseModel):
     title: str
     description: Optional[str] = None
@@ -79,6 +445,7 @@ class TaskCreate(BaseModel):
     assigned_to: Optional[str] = None
     due_date: Optional[date] = None
     story_points: Optional[int] = None
+    recurrence: Optional[Recurrence] = None
     
     class Config:
         json_encoders = {
@@ -95,17 +462,40 @@ class TaskUpdate(BaseModel):
     assigned_to: Optional[str] = None
     due_date: Optional[date] = None
     story_points: Optional[int] = None
+    recurrence: Optional[Recurrence] = None  # send null to stop a task recurring
     
     class Config:
         json_encoders = {
             date: lambda v: v.isoformat() if v else None
         }
 
+class TaskOccurrence(Task):
+    # One expanded occurrence of a recurring task; id is "<series_id>:<occurrence_date>"
+    series_id: str
+    occurrence_date: date
+
+class TaskOccurrenceUpdate(BaseModel):
+    title: Optional[str] = None
+    description: Optional[str] = None
+    status: Optional[TaskStatus] = None
+    priority: Optional[TaskPriority] = None
+    assigned_to: Optional[str] = None
+    story_points: Optional[int] = None
+
+class StatusTotals(BaseModel):
+    count: int = 0
+    story_points: int = 0
+
+class TaskCounters(StatusTotals):
+    # Denormalized onto projects and sprints; maintained by the task writes
+    by_status: Dict[str, StatusTotals] = Field(default_factory=lambda: {s.value: StatusTotals() for s in TaskStatus})
+
 class Project(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     name: str
     description: Optional[str] = None
     color: str = "#8B5CF6"  # Default purple
+    counters: TaskCounters = Field(default_factory=TaskCounters)
     created_date: datetime = Field(default_factory=datetime.utcnow)
     updated_date: datetime = Field(default_factory=datetime.utcnow)
 
@@ -123,6 +513,7 @@ class Sprint(BaseModel):
     start_date: Optional[date] = None
     end_date: Optional[date] = None
     goal: Optional[str] = None
+    counters: TaskCounters = Field(default_factory=TaskCounters)
     created_date: datetime = Field(default_factory=datetime.utcnow)
     updated_date: datetime = Field(default_factory=datetime.utcnow)
     
@@ -134,9 +525,9 @@ class Sprint(BaseModel):
     def dict(self, *args, **kwargs):
         d = super().dict(*args, **kwargs)
         if d.get('start_date'):
-            d['start_date'] = d['start_date'].isoformat() if isinstance(d['start_date'], date) else d['start_date']
+            d['start_date'] = to_bson_date(d['start_date'])
         if d.get('end_date'):
-            d['end_date'] = d['end_date'].isoformat() if isinstance(d['end_date'], date) else d['end_date']
+            d['end_date'] = to_bson_date(d['end_date'])
         return d
 
 class SprintCreate(BaseModel):
@@ -152,28 +543,746 @@ class SprintCreate(BaseModel):
             date: lambda v: v.isoformat() if v else None
         }
 
+class Assignee(BaseModel):
+    name: str  # the value tasks carry in assigned_to
+    weekly_capacity: Optional[int] = None  # story points per 7 days; None means unlimited
+    updated_date: datetime = Field(default_factory=datetime.utcnow)
+
+class AssigneeUpdate(BaseModel):
+    weekly_capacity: Optional[int] = Field(None, ge=0)
+
+class TaskSort(str, Enum):
+    CREATED = "created_date"
+    CREATED_DESC = "-created_date"
+    UPDATED = "updated_date"
+    UPDATED_DESC = "-updated_date"
+    DUE = "due_date"
+    DUE_DESC = "-due_date"
+    PRIORITY = "priority"
+    PRIORITY_DESC = "-priority"
+    TITLE = "title"
+    TITLE_DESC = "-title"
+
+class TaskBulkUpdate(TaskUpdate):
+    id: str
+
+# Per-list cap on a bulk request; larger batches get a 422 and must be split
+MAX_BULK_ITEMS = 1000
+
+class TaskBulkRequest(BaseModel):
+    create: List[TaskCreate] = Field([], max_length=MAX_BULK_ITEMS, description=f"At most {MAX_BULK_ITEMS} tasks")
+    update: List[TaskBulkUpdate] = Field([], max_length=MAX_BULK_ITEMS, description=f"At most {MAX_BULK_ITEMS} updates")
+    delete: List[str] = Field([], max_length=MAX_BULK_ITEMS, description=f"At most {MAX_BULK_ITEMS} task ids")
+    ordered: bool = True
+
+class TaskBulkItemResult(BaseModel):
+    op: str
+    id: str
+    status: str  # created, updated, deleted, not_found, skipped or error
+    error: Optional[str] = None
+
+class TaskBulkResponse(BaseModel):
+    created: int = 0
+    updated: int = 0
+    deleted: int = 0
+    failed: int = 0
+    results: List[TaskBulkItemResult]
+
+class Job(BaseModel):
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    type: str
+    status: JobStatus = JobStatus.PENDING
+    project_id: Optional[str] = None
+    progress: dict = {}
+    error: Optional[str] = None
+    created_date: datetime = Field(default_factory=datetime.utcnow)
+    updated_date: datetime = Field(default_factory=datetime.utcnow)
+
+class TaskTombstone(BaseModel):
+    id: str
+    project_id: Optional[str] = None
+    sprint_id: Optional[str] = None
+    deleted_date: datetime
+
+class TaskEventType(str, Enum):
+    CREATED = "created"
+    UPDATED = "updated"
+    DELETED = "deleted"
+
+class TaskEvent(BaseModel):
+    id: str
+    task_id: str
+    project_id: Optional[str] = None
+    sprint_id: Optional[str] = None
+    type: TaskEventType
+    status: Optional[TaskStatus] = None
+    changes: dict = {}  # field -> [old, new], for updates
+    created_date: datetime
+
+class TaskSearchHit(BaseModel):
+    task: Task
+    score: float
+    title_highlight: str
+    snippet: Optional[str] = None
+
+class TaskSearchResults(BaseModel):
+    query: str
+    offset: int
+    limit: int
+    has_more: bool
+    results: List[TaskSearchHit]
+
+class TaskChanges(BaseModel):
+    since: datetime  # pass back as ?since= on the next poll
+    has_more: bool = False
+    reset_required: bool = False
+    upserted: List[Task] = []
+    deleted: List[TaskTombstone] = []
+
+class DataEntity(str, Enum):
+    TASKS = "tasks"
+    PROJECTS = "projects"
+    SPRINTS = "sprints"
+
+class DataFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+class ImportRowError(BaseModel):
+    row: int  # 1-based data row, not counting a CSV header
+    id: Optional[str] = None
+    error: str
+
+class ImportReport(BaseModel):
+    entity: DataEntity
+    format: DataFormat
+    rows: int = 0
+    inserted: int = 0
+    failed: int = 0
+    errors: List[ImportRowError] = []
+    errors_truncated: int = 0  # row errors beyond MAX_IMPORT_ERRORS, counted but not listed
+
+# Pagination
+# List endpoints page with a keyset on their sort fields, by default (created_date, id),
+# so results keep their chronological order and every page is an index range scan. The
+# opaque cursor for the next page holds the last row's sort values and is returned in
+# the X-Next-Cursor header, keeping the body a plain list.
+DEFAULT_PAGE_SIZE = 1000
+MAX_PAGE_SIZE = 1000
+STREAM_BATCH_SIZE = 500
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+PAGE_SORT = [("created_date", ASCENDING), ("id", ASCENDING)]
+
+def encode_cursor(doc: dict, sort=PAGE_SORT) -> str:
+    values = []
+    for field, _ in sort:
+        value = doc.get(field)
+        values.append({"$date": value.isoformat()} if isinstance(value, datetime) else value)
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+def decode_cursor(cursor: str, sort=PAGE_SORT) -> list:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if not isinstance(values, list) or len(values) != len(sort):
+            raise ValueError("cursor does not match the sort order")
+        return [datetime.fromisoformat(value["$date"]) if isinstance(value, dict) else value for value in values]
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def keyset_query(query: dict, after: Optional[str], sort=PAGE_SORT) -> dict:
+    if not after:
+        return query
+    values = decode_cursor(after, sort)
+    # Rows after the cursor: equal on a prefix of the sort fields and past it on the next
+    clauses = []
+    for i, (field, direction) in enumerate(sort):
+        clause = {prefix: values[j] for j, (prefix, _) in enumerate(sort[:i])}
+        value = values[i]
+        if direction == ASCENDING:
+            # null sorts first, so everything non-null comes after it
+            clause[field] = {"$ne": None} if value is None else {"$gt": value}
+        elif value is None:
+            continue
+        else:
+            # null sorts last when descending; $not also matches null and missing
+            clause[field] = {"$not": {"$gte": value}}
+        clauses.append(clause)
+    return {"$and": [query, {"$or": clauses}]} if "$or" in query else {**query, "$or": clauses}
+
+def select_fields(doc: dict, fields: List[str], model) -> dict:
+    row = {field: doc.get(field) for field in fields}
+    # Fields added to a model after a document was written take the model default,
+    # as they would when the document is loaded into the model
+    defaults = model_defaults(model)
+    for field in fields:
+        if field not in doc and field in defaults:
+            row[field] = defaults[field]()
+    for field in DATE_ONLY_FIELDS:
+        if field in row:
+            row[field] = as_date(row[field])
+    if row.get("recurrence"):
+        row["recurrence"] = {
+            **row["recurrence"],
+            "until": as_date(row["recurrence"].get("until")),
+            "exceptions": [as_date(day) for day in row["recurrence"].get("exceptions") or []],
+        }
+    return row
+
+@lru_cache(maxsize=None)
+def model_field_names(model) -> Tuple[str, ...]:
+    return tuple(model.__fields__)
+
+def default_value(field) -> Any:
+    value = field.get_default(call_default_factory=True)
+    return value.dict() if isinstance(value, BaseModel) else value
+
+@lru_cache(maxsize=None)
+def model_defaults(model) -> Dict[str, Callable[[], Any]]:
+    """Factories for the model's non-None defaults, by field name."""
+    return {
+        name: partial(default_value, field)
+        for name, field in model.__fields__.items()
+        if not field.is_required() and (field.default_factory is not None or field.default is not None)
+    }
+
+def read_projection(model, fields: Optional[List[str]], sort=()) -> Tuple[List[str], dict]:
+    # Reads fetch only the response fields (plus sort keys for the cursor) and never _id
+    fields = fields or list(model_field_names(model))
+    return fields, {"_id": 0, **{field: 1 for field in fields + [f for f, _ in sort]}}
+
+async def fetch_page(collection, query: dict, model, limit: int, after: Optional[str],
+                     sort=PAGE_SORT, fields: Optional[List[str]] = None) -> Tuple[List[dict], Optional[str]]:
+    # Rows are returned as plain dicts in the model's shape, ready for json_rows
+    fields, projection = read_projection(model, fields, sort)
+    docs = await collection.find(keyset_query(query, after, sort), projection).sort(sort).to_list(limit + 1)
+    next_cursor = None
+    if len(docs) > limit:
+        docs = docs[:limit]
+        next_cursor = encode_cursor(docs[-1], sort)
+    return [select_fields(doc, fields, model) for doc in docs], next_cursor
+
+async def paginate(collection, query: dict, model, response: Response, limit: int, after: Optional[str],
+                   sort=PAGE_SORT, fields: Optional[List[str]] = None) -> ORJSONResponse:
+    items, next_cursor = await fetch_page(collection, query, model, limit, after, sort, fields)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return json_rows(items, response)
+
+def json_rows(rows: List[dict], response: Response) -> ORJSONResponse:
+    # Documents are stored in their model's shape, so list reads encode them straight to
+    # JSON bytes rather than validating each into a model and serializing it again.
+    # Returning a response skips response_model, so headers set on response are copied over.
+    return ORJSONResponse(rows, headers=dict(response.headers))
+
+def stream_ndjson(collection, query: dict, model, limit: Optional[int], after: Optional[str],
+                  sort=PAGE_SORT, fields: Optional[List[str]] = None) -> StreamingResponse:
+    # Documents are serialized one at a time as the cursor yields them, so memory
+    # stays bounded by the cursor batch size rather than the result size.
+    fields, projection = read_projection(model, fields)
+    cursor = collection.find(keyset_query(query, after, sort), projection).sort(sort).batch_size(STREAM_BATCH_SIZE)
+    if limit:
+        cursor = cursor.limit(limit)
+
+    async def lines():
+        async for doc in cursor:
+            yield orjson.dumps(select_fields(doc, fields, model)) + b"\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+# Read cache
+# Projects and sprints are read on every page load but change rarely, so their reads
+# are served from a per-process TTL + LRU cache. The write handlers invalidate the
+# affected entries; other worker processes converge within the TTL.
+READ_CACHE_TTL_SECONDS = float(os.environ.get('READ_CACHE_TTL_SECONDS', '30'))
+READ_CACHE_MAX_ENTRIES = int(os.environ.get('READ_CACHE_MAX_ENTRIES', '1024'))
+
+class ReadCache:
+    def __init__(self, name: str, ttl: float = READ_CACHE_TTL_SECONDS, max_entries: int = READ_CACHE_MAX_ENTRIES):
+        self.name = name
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self.hits = self.misses = self.evictions = self.expirations = self.invalidations = 0
+        # Bumped on every invalidation so a read that raced a write is not cached
+        self.generation = 0
+
+    def get(self, key: Hashable):
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, value = entry
+        if expires_at <= monotonic():
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, generation: Optional[int] = None):
+        if self.ttl <= 0 or self.max_entries <= 0:
+            return
+        if generation is not None and generation != self.generation:
+            return
+        self._entries[key] = (monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, *keys: Hashable):
+        self.generation += 1
+        for key in keys:
+            if self._entries.pop(key, None) is not None:
+                self.invalidations += 1
+
+    def invalidate_where(self, predicate: Callable[[Hashable, Any], bool]):
+        self.invalidate(*[key for key, (_, value) in self._entries.items() if predicate(key, value)])
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
+
+project_cache = ReadCache("projects")
+sprint_cache = ReadCache("sprints")
+
+def is_list_entry(key: Hashable, value: Any) -> bool:
+    return key[0] == "list"
+
+def item_entries(*item_ids: str) -> Callable[[Hashable, Any], bool]:
+    # Item entries are keyed on the collection version as well, so match every version
+    return lambda key, value: key[0] == "item" and key[1] in item_ids
+
+async def cached_page(cache: ReadCache, key: tuple, collection, query: dict, model,
+                      response: Response, limit: int, after: Optional[str]):
+    page = cache.get(key)
+    if page is None:
+        generation = cache.generation
+        page = await fetch_page(collection, query, model, limit, after)
+        cache.set(key, page, generation)
+    items, next_cursor = page
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return json_rows(items, response)
+
+# Conditional GET
+# Each collection has a version counter in collection_versions, bumped after every
+# write. Read endpoints derive a strong ETag from the versions they depend on plus the
+# request URL, so If-None-Match is answered with 304 after one point lookup instead of
+# running the query and serializing the result.
+async def bump_versions(*collections: str):
+    names = list(dict.fromkeys(collections))
+    if names:
+        await db.collection_versions.bulk_write(
+            [UpdateOne({"_id": name}, {"$inc": {"version": 1}}, upsert=True) for name in names], ordered=False
+        )
+
+async def collection_etag(request: Request, *collections: str, extra: Optional[str] = None) -> str:
+    versions = {}
+    async for doc in db.collection_versions.find({"_id": {"$in": list(collections)}}):
+        versions[doc["_id"]] = doc["version"]
+    # Kept for read caches: keying entries on the version keeps a page cached by this
+    # process from being served under the ETag of a newer write made by another one
+    request.state.collection_versions = versions
+    raw = json.dumps([
+        [[name, versions.get(name, 0)] for name in collections],
+        request.url.path,
+        sorted(request.query_params.multi_items()),
+        extra,
+    ])
+    return '"' + hashlib.sha1(raw.encode()).hexdigest() + '"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+async def conditional_get(request: Request, response: Response, *collections: str,
+                          extra: Optional[str] = None) -> Optional[Response]:
+    """Return a 304 response if the client's copy is current, else tag the response."""
+    # extra covers inputs other than the data and the URL, such as the current date
+    etag = await collection_etag(request, *collections, extra=extra)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return None
+
+async def reporting_conditional_get(request: Request, response: Response, *collections: str) -> Optional[Response]:
+    """conditional_get for bodies read through reporting_db."""
+    # The versions are read from the primary: a body from a lagging secondary would get
+    # the newest ETag and be confirmed with 304s until the next write, so skip ETags there
+    if MONGO_REPORTING_READ_PREFERENCE != "primary":
+        return None
+    return await conditional_get(request, response, *collections)
+
+# Change feed
+# Deleted tasks leave a tombstone so GET /tasks/changes can report deletions; the
+# tombstones expire after TASK_TOMBSTONE_RETENTION_DAYS, and clients polling with an
+# older `since` are told to reload. The next `since` trails the current time by a short
+# settle window so writes still in flight are picked up by the following poll.
+TASK_TOMBSTONE_RETENTION_DAYS = int(os.environ.get('TASK_TOMBSTONE_RETENTION_DAYS', '30'))
+CHANGES_SETTLE_SECONDS = 2
+
+async def record_task_tombstones(tasks: List[dict]):
+    if not tasks:
+        return
+    deleted_date = datetime.utcnow()
+    await db.task_tombstones.insert_many([
+        {"id": task["id"], "project_id": task.get("project_id"), "sprint_id": task.get("sprint_id"), "deleted_date": deleted_date}
+        for task in tasks
+    ])
+
+# Task event log
+# Every task create, update and delete is appended to task_events with the fields it
+# changed. Events are buffered and written with insert_many every
+# TASK_EVENT_FLUSH_SECONDS or TASK_EVENT_BATCH_SIZE events, keeping the insert off the
+# request path; reads flush this process's buffer first. If Mongo is unreachable the
+# buffer is kept, up to TASK_EVENT_MAX_BUFFER events, after which the oldest are dropped.
+TASK_EVENT_BATCH_SIZE = int(os.environ.get('TASK_EVENT_BATCH_SIZE', '200'))
+TASK_EVENT_FLUSH_SECONDS = float(os.environ.get('TASK_EVENT_FLUSH_SECONDS', '1'))
+TASK_EVENT_MAX_BUFFER = 50000
+
+def task_event(kind: TaskEventType, task: dict, changes: Optional[dict] = None) -> dict:
+    return {
+        "id": str(uuid.uuid4()),
+        "task_id": task["id"],
+        "project_id": task.get("project_id"),
+        "sprint_id": task.get("sprint_id"),
+        "type": kind.value,
+        "status": TaskStatus(task["status"]).value if task.get("status") else None,
+        "changes": changes or {},
+        "created_date": datetime.utcnow(),
+    }
+
+def task_changes(before: dict, after: dict) -> dict:
+    return {
+        field: [before.get(field), value]
+        for field, value in after.items()
+        if field not in ("_id", "updated_date", "priority_rank") and before.get(field) != value
+    }
+
+class TaskEventLog:
+    def __init__(self):
+        self._buffer: List[dict] = []
+        self._task: Optional[asyncio.Task] = None
+        self._flushing: Optional[asyncio.Task] = None
+        self.written = self.dropped = 0
+
+    def append(self, *events: dict):
+        self._buffer.extend(events)
+        if len(self._buffer) > TASK_EVENT_MAX_BUFFER:
+            overflow = len(self._buffer) - TASK_EVENT_MAX_BUFFER
+            del self._buffer[:overflow]
+            self.dropped += overflow
+            logger.error("Task event buffer full, dropped %d events", overflow)
+        if len(self._buffer) >= TASK_EVENT_BATCH_SIZE and (self._flushing is None or self._flushing.done()):
+            self._flushing = asyncio.create_task(self.flush())
+
+    async def flush(self):
+        while self._buffer:
+            batch, self._buffer = self._buffer[:TASK_EVENT_BATCH_SIZE], self._buffer[TASK_EVENT_BATCH_SIZE:]
+            try:
+                await db.task_events.insert_many(batch, ordered=False)
+                self.written += len(batch)
+            except PyMongoError:
+                logger.warning("Could not write %d task events, will retry", len(batch), exc_info=True)
+                self._buffer[:0] = batch
+                return
+
+    def start(self):
+        self._task = asyncio.create_task(self._loop())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        await self.flush()
+
+    async def _loop(self):
+        while True:
+            await asyncio.sleep(TASK_EVENT_FLUSH_SECONDS)
+            await self.flush()
+
+task_event_log = TaskEventLog()
+
+async def find_task_events(response: Response, query: dict, since: Optional[datetime], until: Optional[datetime],
+                           limit: int, after: Optional[str]) -> ORJSONResponse:
+    await task_event_log.flush()
+    if since or until:
+        query["created_date"] = {}
+        if since:
+            query["created_date"]["$gte"] = since
+        if until:
+            query["created_date"]["$lt"] = until
+    return await paginate(db.task_events, query, TaskEvent, response, limit, after)
+
 # Task endpoints
 @api_router.post("/tasks", response_model=Task)
 async def create_task(task: TaskCreate):
+    error = recurrence_error(task)
+    if error:
+        raise HTTPException(status_code=400, detail=error)
+    await ensure_projects_writable(task.project_id)
     task_dict = task.dict()
-    # Convert date objects to ISO format strings
-    if task_dict.get('due_date'):
-        task_dict['due_date'] = task_dict['due_date'].isoformat() if isinstance(task_dict['due_date'], date) else task_dict['due_date']
-    
     task_obj = Task(**task_dict)
-    await db.tasks.insert_one(task_obj.dict())
+    task_doc = task_document(task_obj)
+    await db.tasks.insert_one(task_doc)
+    await apply_task_changes([], [task_doc])
+    task_event_log.append(task_event(TaskEventType.CREATED, task_doc))
     return task_obj
 
+RECURRENCE_DUE_DATE_ERROR = "A recurring task needs a due_date for its first occurrence"
+
+def recurrence_error(task: TaskCreate) -> Optional[str]:
+    return stored_recurrence_error(task.dict())
+
+def stored_recurrence_error(task: dict) -> Optional[str]:
+    if task.get("recurrence") and not task.get("due_date"):
+        return RECURRENCE_DUE_DATE_ERROR
+    return None
+
+def recurrence_update_filter(update_data: dict) -> Optional[dict]:
+    """Extra filter the stored task must match for the update to leave it valid, or None if it never can."""
+    # Fields the update leaves alone are checked against the stored task
+    if "recurrence" not in update_data:
+        if "due_date" in update_data and not update_data["due_date"]:
+            return {"recurrence": None}
+        return {}
+    if update_data["recurrence"] and "due_date" not in update_data:
+        return {"due_date": {"$ne": None}}
+    return None if stored_recurrence_error(update_data) else {}
+
+def task_document(task_obj: Task) -> dict:
+    task_doc = task_obj.dict()
+    task_doc["priority_rank"] = PRIORITY_RANK[TaskPriority(task_doc["priority"]).value]
+    return task_doc
+
+def task_update_fields(task_update: TaskUpdate) -> dict:
+    update_data = task_update.dict(exclude_unset=True)
+    if update_data.get('due_date'):
+        update_data['due_date'] = to_bson_date(update_data['due_date'])
+    if update_data.get('priority'):
+        update_data['priority_rank'] = PRIORITY_RANK[TaskPriority(update_data['priority']).value]
+    if update_data.get('recurrence'):
+        update_data['recurrence'] = recurrence_document(update_data['recurrence'])
+    
+    update_data["updated_date"] = datetime.utcnow()
+    return update_data
+
+def task_sort(sort: Optional[TaskSort]) -> list:
+    if sort is None:
+        return PAGE_SORT
+    field = sort.value.lstrip("-")
+    direction = -1 if sort.value.startswith("-") else ASCENDING
+    return [("priority_rank" if field == "priority" else field, direction), ("id", ASCENDING)]
+
+def task_fields(fields: Optional[str]) -> Optional[List[str]]:
+    if not fields:
+        return None
+    requested = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = sorted(set(requested) - set(model_field_names(Task)))
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    return ["id"] + [field for field in dict.fromkeys(requested) if field != "id"]
+
 @api_router.get("/tasks", response_model=List[Task])
-async def get_tasks(project_id: Optional[str] = None, sprint_id: Optional[str] = None):
+async def get_tasks(
+    request: Request,
+    response: Response,
+    project_id: Optional[str] = None,
+    sprint_id: Optional[str] = None,
+    status: Optional[List[TaskStatus]] = Query(None),
+    priority: Optional[List[TaskPriority]] = Query(None),
+    assigned_to: Optional[str] = None,
+    due_from: Optional[date] = None,
+    due_to: Optional[date] = None,
+    overdue: bool = False,
+    sort: Optional[TaskSort] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated Task fields to return, e.g. id,title,status"),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    stream: bool = False,
+):
     query = {}
     if project_id:
         query["project_id"] = project_id
     if sprint_id:
         query["sprint_id"] = sprint_id
+    if assigned_to:
+        query["assigned_to"] = assigned_to
+    if status:
+        query["status"] = {"$in": [value.value for value in status]}
+    if priority:
+        query["priority"] = {"$in": [value.value for value in priority]}
+    due, today = {}, datetime.utcnow().date()
+    if due_from:
+        due["$gte"] = to_bson_date(due_from)
+    if due_to:
+        due["$lte"] = to_bson_date(due_to)
+    if overdue:
+        due["$lt"] = to_bson_date(today)
+        query.setdefault("status", {})["$ne"] = TaskStatus.DONE.value
+    if due:
+        query["due_date"] = due
+    sort_spec, selected = task_sort(sort), task_fields(fields)
+    
+    if stream:
+        return stream_ndjson(db.tasks, query, Task, limit, after, sort_spec, selected)
+    # The overdue list changes at midnight without any write
+    not_modified = await conditional_get(request, response, "tasks", extra=today.isoformat() if overdue else None)
+    if not_modified:
+        return not_modified
+    return await paginate(db.tasks, query, Task, response, limit or DEFAULT_PAGE_SIZE, after, sort_spec, selected)
+
+@api_router.get("/tasks/changes", response_model=TaskChanges)
+async def get_task_changes(
+    since: datetime,
+    project_id: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+):
+    if since.tzinfo:
+        since = since.astimezone(timezone.utc).replace(tzinfo=None)
+    now = datetime.utcnow()
+    if since < now - timedelta(days=TASK_TOMBSTONE_RETENTION_DAYS):
+        return TaskChanges(since=now - timedelta(seconds=CHANGES_SETTLE_SECONDS), reset_required=True)
+    
+    task_query = {"updated_date": {"$gt": since}}
+    tombstone_query = {"deleted_date": {"$gt": since}}
+    if project_id:
+        task_query["project_id"] = project_id
+        tombstone_query["project_id"] = project_id
+    tasks = await db.tasks.find(task_query).sort([("updated_date", ASCENDING), ("id", ASCENDING)]).to_list(limit + 1)
+    tombstones = await db.task_tombstones.find(tombstone_query).sort("deleted_date", ASCENDING).to_list(limit + 1)
     
-    tasks = await db.tasks.find(query).to_list(1000)
-    return [Task(**task) for task in tasks]
+    changes = TaskChanges(since=max(since, now - timedelta(seconds=CHANGES_SETTLE_SECONDS)))
+    truncated_at = []
+    if len(tasks) > limit:
+        tasks = tasks[:limit]
+        truncated_at.append(tasks[-1]["updated_date"])
+    if len(tombstones) > limit:
+        tombstones = tombstones[:limit]
+        truncated_at.append(tombstones[-1]["deleted_date"])
+    if truncated_at:
+        # Step back one millisecond (Mongo's date precision) so changes sharing the
+        # last timestamp are not skipped; re-sent changes are idempotent for the client
+        changes.has_more = True
+        changes.since = min(truncated_at) - timedelta(milliseconds=1)
+    changes.upserted = [Task(**task) for task in tasks]
+    changes.deleted = [TaskTombstone(**tombstone) for tombstone in tombstones]
+    return changes
+
+# Task search
+# Backed by the weighted text index on title and description. Results are ranked by
+# textScore, so they page by offset; highlighting is done only for the returned page.
+MAX_SEARCH_RESULTS = 100
+MAX_SEARCH_OFFSET = 10000
+SNIPPET_CONTEXT_CHARS = 60
+
+def search_terms(q: str) -> List[str]:
+    # Quoted phrases and plain words; negated terms (-word) are never highlighted
+    terms = re.findall(r'"([^"]+)"|(-?\w+)', q)
+    return [phrase or word for phrase, word in terms if (phrase or word) and not (phrase or word).startswith("-")]
+
+def highlight_pattern(terms: List[str]) -> Optional[re.Pattern]:
+    if not terms:
+        return None
+    # Text search matches word stems, so highlight whole words starting with a term
+    return re.compile(r"\b(" + "|".join(re.escape(term) for term in terms) + r")\w*", re.IGNORECASE)
+
+def highlight(text: str, pattern: Optional[re.Pattern]) -> str:
+    if pattern is None:
+        return html.escape(text)
+    # Match on the raw text and escape each piece, so terms never match inside entities
+    parts, position = [], 0
+    for match in pattern.finditer(text):
+        parts.append(html.escape(text[position:match.start()]))
+        parts.append(f"<mark>{html.escape(match.group(0))}</mark>")
+        position = match.end()
+    parts.append(html.escape(text[position:]))
+    return "".join(parts)
+
+def snippet(text: Optional[str], pattern: Optional[re.Pattern]) -> Optional[str]:
+    if not text:
+        return None
+    match = pattern.search(text) if pattern else None
+    if not match:
+        return highlight(text[:2 * SNIPPET_CONTEXT_CHARS], pattern) + ("…" if len(text) > 2 * SNIPPET_CONTEXT_CHARS else "")
+    start = max(0, match.start() - SNIPPET_CONTEXT_CHARS)
+    end = min(len(text), match.end() + SNIPPET_CONTEXT_CHARS)
+    return ("…" if start else "") + highlight(text[start:end], pattern) + ("…" if end < len(text) else "")
+
+@api_router.get("/tasks/search", response_model=TaskSearchResults)
+async def search_tasks(
+    q: str = Query(..., min_length=1, max_length=200),
+    project_id: Optional[str] = None,
+    sprint_id: Optional[str] = None,
+    status: Optional[TaskStatus] = None,
+    priority: Optional[TaskPriority] = None,
+    assigned_to: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=MAX_SEARCH_RESULTS),
+    offset: int = Query(0, ge=0, le=MAX_SEARCH_OFFSET),
+):
+    query = {"$text": {"$search": q}}
+    for field, value in (("project_id", project_id), ("sprint_id", sprint_id), ("status", status),
+                         ("priority", priority), ("assigned_to", assigned_to)):
+        if value:
+            query[field] = value.value if isinstance(value, Enum) else value
+    score = {"$meta": "textScore"}
+    docs = await reporting_db.tasks.find(query, {"_id": 0, "score": score}).sort([("score", score)]).skip(offset).to_list(limit + 1)
+    
+    pattern = highlight_pattern(search_terms(q))
+    results = [
+        TaskSearchHit(
+            task=Task(**doc),
+            score=doc["score"],
+            title_highlight=highlight(doc["title"], pattern),
+            snippet=snippet(doc.get("description"), pattern),
+        )
+        for doc in docs[:limit]
+    ]
+    return TaskSearchResults(query=q, offset=offset, limit=limit, has_more=len(docs) > limit, results=results)
+
+@api_router.get("/task-events", response_model=List[TaskEvent])
+async def get_task_events(
+    response: Response,
+    task_id: Optional[str] = None,
+    project_id: Optional[str] = None,
+    sprint_id: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+):
+    query = {}
+    if task_id:
+        query["task_id"] = task_id
+    if project_id:
+        query["project_id"] = project_id
+    if sprint_id:
+        query["sprint_id"] = sprint_id
+    return await find_task_events(response, query, since, until, limit, after)
+
+@api_router.get("/tasks/{task_id}/events", response_model=List[TaskEvent])
+async def get_task_history(
+    task_id: str,
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+):
+    return await find_task_events(response, {"task_id": task_id}, None, None, limit, after)
 
 @api_router.get("/tasks/{task_id}", response_model=Task)
 async def get_task(task_id: str):
@@ -184,141 +1293,2167 @@ async def get_task(task_id: str):
 
 @api_router.put("/tasks/{task_id}", response_model=Task)
 async def update_task(task_id: str, task_update: TaskUpdate):
-    existing_task = await db.tasks.find_one({"id": task_id})
+    update_data = task_update_fields(task_update)
+    recurrence_filter = recurrence_update_filter(update_data)
+    if recurrence_filter is None:
+        raise HTTPException(status_code=400, detail=RECURRENCE_DUE_DATE_ERROR)
+    await ensure_projects_writable(update_data.get("project_id"))
+    
+    # Single atomic round trip: apply the patch and return the previous document,
+    # which the day summaries need; the new one is the previous plus the $set
+    existing_task = await db.tasks.find_one_and_update(
+        {"id": task_id, **recurrence_filter}, {"$set": update_data}, return_document=ReturnDocument.BEFORE
+    )
     if not existing_task:
+        # Only a miss on the recurrence filter costs the extra lookup
+        if recurrence_filter and await db.tasks.find_one({"id": task_id}, {"_id": 1}):
+            raise HTTPException(status_code=400, detail=RECURRENCE_DUE_DATE_ERROR)
         raise HTTPException(status_code=404, detail="Task not found")
-    
-    update_data = task_update.dict(exclude_unset=True)
-    # Convert date objects to ISO format strings
-    if update_data.get('due_date'):
-        update_data['due_date'] = update_data['due_date'].isoformat() if isinstance(update_data['due_date'], date) else update_data['due_date']
-    
-    update_data["updated_date"] = datetime.utcnow()
-    
-    await db.tasks.update_one({"id": task_id}, {"$set": update_data})
-    updated_task = await db.tasks.find_one({"id": task_id})
+    updated_task = {**existing_task, **update_data}
+    await apply_task_changes([existing_task], [updated_task])
+    task_event_log.append(task_event(TaskEventType.UPDATED, updated_task, task_changes(existing_task, updated_task)))
     return Task(**updated_task)
 
 @api_router.delete("/tasks/{task_id}")
 async def delete_task(task_id: str):
-    result = await db.tasks.delete_one({"id": task_id})
-    if result.deleted_count == 0:
+    deleted_task = await db.tasks.find_one_and_delete({"id": task_id})
+    if not deleted_task:
         raise HTTPException(status_code=404, detail="Task not found")
+    await asyncio.gather(
+        record_task_tombstones([deleted_task]),
+        forget_task_occurrences([task_id]),
+        apply_task_changes([deleted_task], []),
+    )
+    task_event_log.append(task_event(TaskEventType.DELETED, deleted_task))
     return {"message": "Task deleted successfully"}
 
+@api_router.post("/tasks/bulk", response_model=TaskBulkResponse)
+async def bulk_tasks(bulk: TaskBulkRequest):
+    # Creates, updates and deletes go to Mongo as a single bulk_write. Updates and
+    # deletes for ids that do not exist are reported as not_found without a write.
+    target_ids = [item.id for item in bulk.update] + bulk.delete
+    # Every operation's before-state comes from one read, so an id may appear only once
+    seen, duplicates = set(), set()
+    for task_id in target_ids:
+        (duplicates if task_id in seen else seen).add(task_id)
+    if duplicates:
+        raise HTTPException(status_code=400, detail=f"Task ids appear more than once: {', '.join(sorted(duplicates))}")
+    for index, task in enumerate(bulk.create):
+        error = recurrence_error(task)
+        if error:
+            raise HTTPException(status_code=400, detail=f"create[{index}]: {error}")
+    await ensure_projects_writable(
+        *[task.project_id for task in bulk.create], *[item.project_id for item in bulk.update]
+    )
+    existing = {}
+    if target_ids:
+        async for doc in db.tasks.find({"id": {"$in": target_ids}}, {"_id": 0}):
+            existing[doc["id"]] = doc
+    for index, item in enumerate(bulk.update):
+        if item.id in existing:
+            error = stored_recurrence_error({**existing[item.id], **item.dict(exclude_unset=True)})
+            if error:
+                raise HTTPException(status_code=400, detail=f"update[{index}]: {error}")
+    
+    # op_changes[i] holds the (before, after) task state of operations[i] for the day summaries
+    results, operations, op_results, op_changes = [], [], [], []
+    for task in bulk.create:
+        task_obj = Task(**task.dict())
+        task_doc = task_document(task_obj)
+        results.append(TaskBulkItemResult(op="create", id=task_obj.id, status="created"))
+        operations.append(InsertOne(task_doc))
+        op_results.append(results[-1])
+        op_changes.append((None, task_doc))
+    for item in bulk.update:
+        result = TaskBulkItemResult(op="update", id=item.id, status="updated")
+        results.append(result)
+        if item.id not in existing:
+            result.status = "not_found"
+            continue
+        update_data = task_update_fields(item)
+        update_data.pop("id")
+        operations.append(UpdateOne({"id": item.id}, {"$set": update_data}))
+        op_results.append(result)
+        op_changes.append((existing[item.id], {**existing[item.id], **update_data}))
+    for task_id in bulk.delete:
+        result = TaskBulkItemResult(op="delete", id=task_id, status="deleted")
+        results.append(result)
+        if task_id not in existing:
+            result.status = "not_found"
+            continue
+        operations.append(DeleteOne({"id": task_id}))
+        op_results.append(result)
+        op_changes.append((existing[task_id], None))
+    
+    if operations:
+        try:
+            await db.tasks.bulk_write(operations, ordered=bulk.ordered)
+        except BulkWriteError as e:
+            failed_indexes = set()
+            for error in e.details.get("writeErrors", []):
+                failed_indexes.add(error["index"])
+                op_results[error["index"]].status = "error"
+                op_results[error["index"]].error = error.get("errmsg")
+            if bulk.ordered and failed_indexes:
+                # An ordered bulk write stops at the first error
+                for result in op_results[min(failed_indexes) + 1:]:
+                    result.status = "skipped"
+        
+        applied = [
+            change for change, result in zip(op_changes, op_results) if result.status not in ("error", "skipped")
+        ]
+        await asyncio.gather(
+            record_task_tombstones([before for before, after in applied if after is None]),
+            forget_task_occurrences([before["id"] for before, after in applied if after is None]),
+            apply_task_changes([before for before, _ in applied if before], [after for _, after in applied if after]),
+        )
+        task_event_log.append(*[
+            task_event(TaskEventType.CREATED, after) if before is None
+            else task_event(TaskEventType.DELETED, before) if after is None
+            else task_event(TaskEventType.UPDATED, after, task_changes(before, after))
+            for before, after in applied
+        ])
+    
+    response = TaskBulkResponse(results=results)
+    for result in results:
+        if result.status in ("created", "updated", "deleted"):
+            setattr(response, result.status, getattr(response, result.status) + 1)
+        elif result.status != "not_found":
+            response.failed += 1
+    return response
+
 # Project endpoints
 @api_router.post("/projects", response_model=Project)
 async def create_project(project: ProjectCreate):
     project_dict = project.dict()
     project_obj = Project(**project_dict)
     await db.projects.insert_one(project_obj.dict())
+    await bump_versions("projects")
+    project_cache.invalidate_where(is_list_entry)
     return project_obj
 
 @api_router.get("/projects", response_model=List[Project])
-async def get_projects():
-    projects = await db.projects.find().to_list(1000)
-    return [Project(**project) for project in projects]
+async def get_projects(
+    request: Request,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    stream: bool = False,
+):
+    # Projects pending background deletion carry deleted_date and are hidden
+    query = {"deleted_date": None}
+    if stream:
+        return stream_ndjson(db.projects, query, Project, limit, after)
+    not_modified = await conditional_get(request, response, "projects")
+    if not_modified:
+        return not_modified
+    limit = limit or DEFAULT_PAGE_SIZE
+    version = request.state.collection_versions.get("projects", 0)
+    return await cached_page(
+        project_cache, ("list", limit, after, version), db.projects, query, Project, response, limit, after
+    )
 
 @api_router.get("/projects/{project_id}", response_model=Project)
-async def get_project(project_id: str):
-    project = await db.projects.find_one({"id": project_id})
-    if not project:
-        raise HTTPException(status_code=404, detail="Project not found")
-    return Project(**project)
+async def get_project(project_id: str, request: Request, response: Response):
+    not_modified = await conditional_get(request, response, "projects")
+    if not_modified:
+        return not_modified
+    # Counters are changed by task writes on any worker; the version in the key keeps
+    # this process from serving an entry older than the latest write
+    key = ("item", project_id, request.state.collection_versions.get("projects", 0))
+    project_obj = project_cache.get(key)
+    if project_obj is None:
+        generation = project_cache.generation
+        project = await db.projects.find_one({"id": project_id, "deleted_date": None})
+        if not project:
+            raise HTTPException(status_code=404, detail="Project not found")
+        project_obj = Project(**project)
+        project_cache.set(key, project_obj, generation)
+    return project_obj
 
 @api_router.put("/projects/{project_id}", response_model=Project)
 async def update_project(project_id: str, project_update: ProjectCreate):
-    existing_project = await db.projects.find_one({"id": project_id})
-    if not existing_project:
-        raise HTTPException(status_code=404, detail="Project not found")
-    
     update_data = project_update.dict()
     update_data["updated_date"] = datetime.utcnow()
     
-    await db.projects.update_one({"id": project_id}, {"$set": update_data})
-    updated_project = await db.projects.find_one({"id": project_id})
+    updated_project = await db.projects.find_one_and_update(
+        {"id": project_id, "deleted_date": None}, {"$set": update_data}, return_document=ReturnDocument.AFTER
+    )
+    if not updated_project:
+        raise HTTPException(status_code=404, detail="Project not found")
+    await bump_versions("projects")
+    project_cache.invalidate_where(item_entries(project_id))
+    project_cache.invalidate_where(is_list_entry)
     return Project(**updated_project)
 
-@api_router.delete("/projects/{project_id}")
+@api_router.delete("/projects/{project_id}", status_code=202)
 async def delete_project(project_id: str):
-    # Also delete all tasks associated with this project
-    await db.tasks.delete_many({"project_id": project_id})
-    await db.sprints.delete_many({"project_id": project_id})
-    
-    result = await db.projects.delete_one({"id": project_id})
-    if result.deleted_count == 0:
+    # Hide the project now; its tasks and sprints are removed by a background job
+    now = datetime.utcnow()
+    project = await db.projects.find_one_and_update(
+        {"id": project_id, "deleted_date": None}, {"$set": {"deleted_date": now, "updated_date": now}}
+    )
+    if not project:
         raise HTTPException(status_code=404, detail="Project not found")
-    return {"message": "Project and associated tasks deleted successfully"}
+    
+    job = Job(type="project_delete", project_id=project_id)
+    await db.jobs.insert_one(job.dict())
+    await bump_versions("projects")
+    project_cache.invalidate_where(item_entries(project_id))
+    project_cache.invalidate_where(is_list_entry)
+    job_runner.wake()
+    return {"message": "Project deletion started", "job_id": job.id}
+
+async def deleting_projects(project_ids) -> set:
+    """The given projects that are pending deletion."""
+    project_ids = list({project_id for project_id in project_ids if project_id})
+    if not project_ids:
+        return set()
+    return {doc["id"] async for doc in db.projects.find(
+        {"id": {"$in": project_ids}, "deleted_date": {"$ne": None}}, {"_id": 0, "id": 1}
+    )}
+
+async def ensure_projects_writable(*project_ids: Optional[str]):
+    # Tasks and sprints written into a project being deleted would be swept by the
+    # cascade or, once it has passed them, left orphaned
+    deleting = await deleting_projects(project_ids)
+    if deleting:
+        raise HTTPException(status_code=409, detail=f"Project is being deleted: {', '.join(sorted(deleting))}")
 
 # Sprint endpoints
 @api_router.post("/sprints", response_model=Sprint)
 async def create_sprint(sprint: SprintCreate):
+    await ensure_projects_writable(sprint.project_id)
     sprint_dict = sprint.dict()
     sprint_obj = Sprint(**sprint_dict)
     await db.sprints.insert_one(sprint_obj.dict())
+    await bump_versions("sprints")
+    sprint_cache.invalidate_where(is_list_entry)
     return sprint_obj
 
 @api_router.get("/sprints", response_model=List[Sprint])
-async def get_sprints(project_id: Optional[str] = None):
+async def get_sprints(
+    request: Request,
+    response: Response,
+    project_id: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    stream: bool = False,
+):
     query = {}
     if project_id:
         query["project_id"] = project_id
     
-    sprints = await db.sprints.find(query).to_list(1000)
-    return [Sprint(**sprint) for sprint in sprints]
+    if stream:
+        return stream_ndjson(db.sprints, query, Sprint, limit, after)
+    not_modified = await conditional_get(request, response, "sprints")
+    if not_modified:
+        return not_modified
+    limit = limit or DEFAULT_PAGE_SIZE
+    version = request.state.collection_versions.get("sprints", 0)
+    return await cached_page(
+        sprint_cache, ("list", project_id, limit, after, version), db.sprints, query, Sprint, response, limit, after
+    )
 
 @api_router.get("/sprints/{sprint_id}", response_model=Sprint)
-async def get_sprint(sprint_id: str):
-    sprint = await db.sprints.find_one({"id": sprint_id})
-    if not sprint:
-        raise HTTPException(status_code=404, detail="Sprint not found")
-    return Sprint(**sprint)
+async def get_sprint(sprint_id: str, request: Request, response: Response):
+    not_modified = await conditional_get(request, response, "sprints")
+    if not_modified:
+        return not_modified
+    key = ("item", sprint_id, request.state.collection_versions.get("sprints", 0))
+    sprint_obj = sprint_cache.get(key)
+    if sprint_obj is None:
+        generation = sprint_cache.generation
+        sprint = await db.sprints.find_one({"id": sprint_id})
+        if not sprint:
+            raise HTTPException(status_code=404, detail="Sprint not found")
+        sprint_obj = Sprint(**sprint)
+        sprint_cache.set(key, sprint_obj, generation)
+    return sprint_obj
 
 @api_router.put("/sprints/{sprint_id}", response_model=Sprint)
 async def update_sprint(sprint_id: str, sprint_update: SprintCreate):
-    existing_sprint = await db.sprints.find_one({"id": sprint_id})
-    if not existing_sprint:
-        raise HTTPException(status_code=404, detail="Sprint not found")
-    
+    await ensure_projects_writable(sprint_update.project_id)
     update_data = sprint_update.dict()
-    # Convert date objects to ISO format strings
-    if update_data.get('start_date'):
-        update_data['start_date'] = update_data['start_date'].isoformat() if isinstance(update_data['start_date'], date) else update_data['start_date']
-    if update_data.get('end_date'):
-        update_data['end_date'] = update_data['end_date'].isoformat() if isinstance(update_data['end_date'], date) else update_data['end_date']
+    for field in ('start_date', 'end_date'):
+        if update_data.get(field):
+            update_data[field] = to_bson_date(update_data[field])
     
     update_data["updated_date"] = datetime.utcnow()
     
-    await db.sprints.update_one({"id": sprint_id}, {"$set": update_data})
-    updated_sprint = await db.sprints.find_one({"id": sprint_id})
+    updated_sprint = await db.sprints.find_one_and_update(
+        {"id": sprint_id}, {"$set": update_data}, return_document=ReturnDocument.AFTER
+    )
+    if not updated_sprint:
+        raise HTTPException(status_code=404, detail="Sprint not found")
+    await bump_versions("sprints")
+    sprint_cache.invalidate_where(item_entries(sprint_id))
+    sprint_cache.invalidate_where(is_list_entry)
     return Sprint(**updated_sprint)
 
+# Import / export
+# Tasks, projects and sprints can be exported and imported as NDJSON or CSV. Exports
+# stream from a Motor cursor; imports read the request body incrementally, validate
+# rows against the create models and insert them in unordered batches, so memory stays
+# bounded by the batch size whatever the file size. A row may carry an id to keep
+# references between imported tasks, sprints and projects intact.
+IMPORT_BATCH_SIZE = int(os.environ.get('IMPORT_BATCH_SIZE', '500'))
+MAX_IMPORT_ERRORS = 1000
+MAX_IMPORT_RECORD_BYTES = 1024 * 1024
+DATA_MODELS = {
+    DataEntity.TASKS: (Task, TaskCreate),
+    DataEntity.PROJECTS: (Project, ProjectCreate),
+    DataEntity.SPRINTS: (Sprint, SprintCreate),
+}
+IMPORT_TIMESTAMP_FIELDS = ("created_date", "updated_date")
+# Nested fields are written to CSV cells as JSON
+CSV_JSON_FIELDS = ("recurrence",)
+DATA_MEDIA_TYPES = {DataFormat.NDJSON: "application/x-ndjson", DataFormat.CSV: "text/csv"}
+
+def csv_cell(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, dict):
+        return orjson.dumps(value).decode()
+    return str(value)
+
+def csv_line(values) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(values)
+    return buffer.getvalue()
+
+@api_router.get("/export/{entity}")
+async def export_data(entity: DataEntity, format: DataFormat = DataFormat.NDJSON, project_id: Optional[str] = None):
+    model = DATA_MODELS[entity][0]
+    fields = list(model_field_names(model))
+    query = {"deleted_date": None} if entity == DataEntity.PROJECTS else {}
+    if project_id:
+        query["id" if entity == DataEntity.PROJECTS else "project_id"] = project_id
+    cursor = db[entity.value].find(query, {"_id": 0, **{field: 1 for field in fields}}).sort(PAGE_SORT)
+
+    async def rows():
+        if format == DataFormat.CSV:
+            yield csv_line(fields)
+        async for doc in cursor.batch_size(STREAM_BATCH_SIZE):
+            row = select_fields(doc, fields, model)
+            if format == DataFormat.CSV:
+                yield csv_line([csv_cell(row[field]) for field in fields])
+            else:
+                yield orjson.dumps(row) + b"\n"
+
+    filename = f"{entity.value}-{datetime.utcnow():%Y%m%d-%H%M%S}.{format.value}"
+    return StreamingResponse(rows(), media_type=DATA_MEDIA_TYPES[format],
+                             headers={"Content-Disposition": f'attachment; filename="{filename}"'})
+
+async def import_records(request: Request, format: DataFormat):
+    """Yield (row number, dict or error message) for each record of the streamed body."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    pending, header, row, skipping = "", None, 0, False
+    async for chunk in request.stream():
+        pending += decoder.decode(chunk)
+        if skipping:
+            # Drop the rest of an oversized record; the next one starts after its newline
+            if "\n" not in pending:
+                pending = ""
+                continue
+            pending, skipping = pending[pending.index("\n") + 1:], False
+        # A CSV record is complete once its quotes are balanced; it may span lines
+        while "\n" in pending:
+            end = pending.index("\n") + 1
+            if format == DataFormat.CSV:
+                while pending.count('"', 0, end) % 2:
+                    next_end = pending.find("\n", end) + 1
+                    if not next_end:
+                        break
+                    end = next_end
+                if pending.count('"', 0, end) % 2:
+                    break
+            record, pending = pending[:end], pending[end:]
+            if not record.strip():
+                continue
+            if format == DataFormat.CSV and header is None:
+                header = [name.strip() for name in next(csv.reader([record]))]
+                continue
+            row += 1
+            if len(record) > MAX_IMPORT_RECORD_BYTES:
+                yield row, f"Record exceeds {MAX_IMPORT_RECORD_BYTES} bytes"
+            else:
+                yield row, parse_import_record(record, format, header)
+        if len(pending) > MAX_IMPORT_RECORD_BYTES:
+            row += 1
+            yield row, f"Record exceeds {MAX_IMPORT_RECORD_BYTES} bytes"
+            pending, skipping = "", True
+    pending += decoder.decode(b"", final=True)
+    if pending.strip() and not skipping and not (format == DataFormat.CSV and header is None):
+        yield row + 1, parse_import_record(pending, format, header)
+
+def parse_import_record(record: str, format: DataFormat, header: Optional[List[str]]):
+    if format == DataFormat.NDJSON:
+        try:
+            value = json.loads(record)
+        except ValueError as e:
+            return f"Invalid JSON: {e}"
+        return value if isinstance(value, dict) else "Expected a JSON object"
+    values = next(csv.reader([record]), [])
+    if len(values) != len(header):
+        return f"Expected {len(header)} columns, got {len(values)}"
+    # Empty cells mean "not set", so model defaults apply
+    record = {name: value for name, value in zip(header, values) if value != ""}
+    for name in CSV_JSON_FIELDS:
+        if name in record:
+            try:
+                record[name] = json.loads(record[name])
+            except ValueError:
+                return f"{name}: invalid JSON"
+    return record
+
+def validation_message(e: ValidationError) -> str:
+    return "; ".join(f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in e.errors())
+
+async def after_import(entity: DataEntity, docs: List[dict]):
+    if entity == DataEntity.TASKS:
+        await apply_task_changes([], docs)
+        task_event_log.append(*[task_event(TaskEventType.CREATED, doc) for doc in docs])
+        return
+    await bump_versions(entity.value)
+    if entity == DataEntity.PROJECTS:
+        project_cache.invalidate_where(is_list_entry)
+    else:
+        sprint_cache.invalidate_where(is_list_entry)
+
+@api_router.post("/import/{entity}", response_model=ImportReport)
+async def import_data(entity: DataEntity, request: Request, format: Optional[DataFormat] = None):
+    """Import rows from a raw NDJSON or CSV request body (format defaults from Content-Type)."""
+    if format is None:
+        content_type = request.headers.get("content-type", "")
+        format = DataFormat.CSV if "csv" in content_type else DataFormat.NDJSON
+    model, create_model = DATA_MODELS[entity]
+    report = ImportReport(entity=entity, format=format)
+
+    def fail(row: int, error: str, doc_id: Optional[str] = None):
+        report.failed += 1
+        if len(report.errors) < MAX_IMPORT_ERRORS:
+            report.errors.append(ImportRowError(row=row, id=doc_id, error=error))
+        else:
+            report.errors_truncated += 1
+
+    async def flush(batch: List[Tuple[int, dict]]):
+        if entity != DataEntity.PROJECTS:
+            deleting = await deleting_projects(doc.get("project_id") for _, doc in batch)
+            for row, doc in batch:
+                if doc.get("project_id") in deleting:
+                    fail(row, "Project is being deleted", doc["id"])
+            batch = [(row, doc) for row, doc in batch if doc.get("project_id") not in deleting]
+            if not batch:
+                return
+        try:
+            await db[entity.value].insert_many([doc for _, doc in batch], ordered=False)
+            inserted = [doc for _, doc in batch]
+        except BulkWriteError as e:
+            failed = {error["index"]: error.get("errmsg", "write failed") for error in e.details.get("writeErrors", [])}
+            for index, message in failed.items():
+                row, doc = batch[index]
+                fail(row, "Duplicate id" if "duplicate key" in message.lower() else message, doc["id"])
+            inserted = [doc for index, (_, doc) in enumerate(batch) if index not in failed]
+        report.inserted += len(inserted)
+        if inserted:
+            await after_import(entity, inserted)
+
+    batch = []
+    async for row, record in import_records(request, format):
+        report.rows = row
+        if isinstance(record, str):
+            fail(row, record)
+            continue
+        doc_id = record.get("id") or None
+        try:
+            create_obj = create_model(**record)
+            # Exported timestamps are kept so history (cycle time, burndown) survives a move
+            timestamps = {field: record[field] for field in IMPORT_TIMESTAMP_FIELDS if record.get(field)}
+            obj = model(**create_obj.dict(), **timestamps, **({"id": str(doc_id)} if doc_id else {}))
+        except ValidationError as e:
+            fail(row, validation_message(e), doc_id)
+            continue
+        for field in IMPORT_TIMESTAMP_FIELDS:
+            value = getattr(obj, field)
+            if value.tzinfo:
+                setattr(obj, field, value.astimezone(timezone.utc).replace(tzinfo=None))
+        error = recurrence_error(create_obj) if entity == DataEntity.TASKS else None
+        if error:
+            fail(row, error, doc_id)
+            continue
+        batch.append((row, task_document(obj) if entity == DataEntity.TASKS else obj.dict()))
+        if len(batch) >= IMPORT_BATCH_SIZE:
+            await flush(batch)
+            batch = []
+    if batch:
+        await flush(batch)
+    return report
+
+# Task counters
+# Projects and sprints carry task counts and story-point totals per status, so board
+# headers and sprint cards read one document instead of summing every task. Task writes
+# keep them current with $inc; the counter reconciliation job recomputes them from the
+# tasks collection in batches to repair any drift.
+COUNTER_OWNERS = (("projects", "project_id", project_cache), ("sprints", "sprint_id", sprint_cache))
+
+def counter_increments(task: dict, sign: int, increments: dict):
+    story_points = (task.get("story_points") or 0) * sign
+    status = TaskStatus(task["status"]).value
+    for collection, field, _ in COUNTER_OWNERS:
+        if not task.get(field):
+            continue
+        inc = increments.setdefault((collection, task[field]), {})
+        for path, value in (
+            ("counters.count", sign),
+            ("counters.story_points", story_points),
+            (f"counters.by_status.{status}.count", sign),
+            (f"counters.by_status.{status}.story_points", story_points),
+        ):
+            inc[path] = inc.get(path, 0) + value
+
+async def apply_counter_changes(before: List[dict], after: List[dict]) -> List[str]:
+    """Move the given task states out of (before) and into (after) the project and sprint counters.
+
+    Returns the collections it changed; their versions are left for the caller to bump.
+    """
+    increments = {}
+    for task in before:
+        counter_increments(task, -1, increments)
+    for task in after:
+        counter_increments(task, 1, increments)
+    changed = {}
+    for (collection, owner_id), inc in increments.items():
+        inc = {path: value for path, value in inc.items() if value}
+        if inc:
+            changed.setdefault(collection, {})[owner_id] = inc
+
+    async def apply(collection: str, cache: ReadCache):
+        await db[collection].bulk_write(
+            [UpdateOne({"id": owner_id}, {"$inc": inc}) for owner_id, inc in changed[collection].items()], ordered=False
+        )
+        cache.invalidate_where(item_entries(*changed[collection]))
+        cache.invalidate_where(is_list_entry)
+
+    await asyncio.gather(*[apply(collection, cache) for collection, _, cache in COUNTER_OWNERS if collection in changed])
+    return list(changed)
+
+async def apply_task_changes(before: List[dict], after: List[dict]):
+    """Bookkeeping after a task write: day summaries, counters and collection versions."""
+    # The summary and counter writes are independent, so they run concurrently; the
+    # versions are bumped once, in one round trip, after everything they cover is written
+    _, counted = await asyncio.gather(apply_day_summary_changes(before, after), apply_counter_changes(before, after))
+    await bump_versions("tasks", *counted)
+
+async def run_counter_reconciliation(job: dict) -> dict:
+    progress = {f"{collection}_reconciled": 0 for collection, _, _ in COUNTER_OWNERS}
+    progress.update(job.get("progress", {}))
+    # Owners are walked in id order; the last id of each batch lets a resumed job continue
+    for collection, field, cache in COUNTER_OWNERS:
+        while True:
+            after = progress.get(f"{collection}_after")
+            owners = await db[collection].find(
+                {"id": {"$gt": after}} if after else {}, {"_id": 0, "id": 1}
+            ).sort("id", ASCENDING).to_list(JOB_BATCH_SIZE)
+            if not owners:
+                break
+            counters = {owner["id"]: TaskCounters().dict() for owner in owners}
+            pipeline = [
+                {"$match": {field: {"$in": list(counters)}}},
+                {"$group": {
+                    "_id": {"owner": f"${field}", "status": "$status"},
+                    "count": {"$sum": 1},
+                    "story_points": {"$sum": {"$ifNull": ["$story_points", 0]}},
+                }},
+            ]
+            async for doc in db.tasks.aggregate(pipeline):
+                owner_counters = counters[doc["_id"]["owner"]]
+                owner_counters["count"] += doc["count"]
+                owner_counters["story_points"] += doc["story_points"]
+                owner_counters["by_status"][TaskStatus(doc["_id"]["status"]).value] = {
+                    "count": doc["count"], "story_points": doc["story_points"],
+                }
+            # Task writes racing this batch can leave a small drift; the next run repairs it
+            await db[collection].bulk_write(
+                [UpdateOne({"id": owner_id}, {"$set": {"counters": value}}) for owner_id, value in counters.items()],
+                ordered=False,
+            )
+            progress[f"{collection}_reconciled"] += len(owners)
+            progress[f"{collection}_after"] = owners[-1]["id"]
+            await record_job_progress(job, progress)
+            await asyncio.sleep(JOB_BATCH_PAUSE_SECONDS)
+        await bump_versions(collection)
+        cache.invalidate_where(lambda key, value: True)
+    return progress
+
+async def queue_counter_reconciliation():
+    # Projects and sprints created before counters existed need a first computation
+    for collection, _, _ in COUNTER_OWNERS:
+        if await db[collection].find_one({"counters": {"$exists": False}}, {"_id": 1}):
+            await queue_job("reconcile_counters")
+            return
+
+@api_router.post("/counters/reconcile", status_code=202)
+async def reconcile_counters():
+    job_id = await queue_job("reconcile_counters")
+    job_runner.wake()
+    return {"message": "Counter reconciliation started", "job_id": job_id}
+
+# Background jobs
+# Long-running work (the project delete cascade, data migrations, counter reconciliation,
+# day summary rebuilds) is stored in the jobs collection and executed by a JobRunner in
+# each process. A runner claims a job with a lease that it renews after every batch, so
+# a job whose process died is picked up by another runner, or by this one after a
+# restart, once the lease expires. Work is done in bounded batches with a pause in
+# between so it never holds long write locks.
+JOB_BATCH_SIZE = int(os.environ.get('JOB_BATCH_SIZE', '500'))
+JOB_BATCH_PAUSE_SECONDS = float(os.environ.get('JOB_BATCH_PAUSE_SECONDS', '0.05'))
+JOB_LEASE_SECONDS = 60
+JOB_POLL_SECONDS = 30
+
+class JobLeaseLost(Exception):
+    """Raised by a job handler once another runner has claimed its job."""
+
+async def claim_job() -> Optional[dict]:
+    now = datetime.utcnow()
+    return await db.jobs.find_one_and_update(
+        {
+            "status": {"$in": [JobStatus.PENDING.value, JobStatus.RUNNING.value]},
+            "$or": [{"lease_until": None}, {"lease_until": {"$lt": now}}],
+        },
+        {"$set": {
+            "status": JobStatus.RUNNING.value,
+            # Identifies this claim, so a runner can tell when its lease was taken over
+            "lease_id": str(uuid.uuid4()),
+            "lease_until": now + timedelta(seconds=JOB_LEASE_SECONDS),
+            "updated_date": now,
+        }},
+        sort=[("created_date", ASCENDING)],
+        return_document=ReturnDocument.AFTER,
+    )
+
+async def record_job_progress(job: dict, progress: dict) -> bool:
+    """Save progress and renew the lease; False if another runner has claimed the job since."""
+    now = datetime.utcnow()
+    result = await db.jobs.update_one({"id": job["id"], "lease_id": job.get("lease_id")}, {"$set": {
+        "progress": progress,
+        "lease_until": now + timedelta(seconds=JOB_LEASE_SECONDS),
+        "updated_date": now,
+    }})
+    return result.matched_count == 1
+
+async def run_project_delete(job: dict) -> dict:
+    project_id = job["project_id"]
+    progress = {"tasks_deleted": 0, "sprints_deleted": 0, **job.get("progress", {})}
+    while True:
+        tasks = await db.tasks.find(
+            {"project_id": project_id},
+            {"_id": 0, "id": 1, "project_id": 1, "sprint_id": 1, "status": 1, "story_points": 1},
+        ).to_list(JOB_BATCH_SIZE)
+        if not tasks:
+            break
+        await record_task_tombstones(tasks)
+        await forget_task_occurrences([task["id"] for task in tasks])
+        task_event_log.append(*[task_event(TaskEventType.DELETED, task) for task in tasks])
+        result = await db.tasks.delete_many({"id": {"$in": [task["id"] for task in tasks]}})
+        await bump_versions("tasks", *await apply_counter_changes(tasks, []))
+        progress["tasks_deleted"] += result.deleted_count
+        await record_job_progress(job, progress)
+        await asyncio.sleep(JOB_BATCH_PAUSE_SECONDS)
+    while True:
+        sprints = await db.sprints.find({"project_id": project_id}, {"_id": 0, "id": 1}).to_list(JOB_BATCH_SIZE)
+        if not sprints:
+            break
+        result = await db.sprints.delete_many({"id": {"$in": [sprint["id"] for sprint in sprints]}})
+        await bump_versions("sprints")
+        progress["sprints_deleted"] += result.deleted_count
+        await record_job_progress(job, progress)
+        await asyncio.sleep(JOB_BATCH_PAUSE_SECONDS)
+    await db.day_summaries.delete_many({"project_id": project_id})
+    await db.projects.delete_one({"id": project_id})
+    await bump_versions("tasks", "sprints", "projects")
+    sprint_cache.invalidate_where(
+        lambda key, value: is_list_entry(key, value) or value.project_id == project_id
+    )
+    return progress
+
+# Tasks and sprints written before dates were stored natively hold them as ISO strings
+DATE_MIGRATIONS = (("tasks", ("due_date",)), ("sprints", ("start_date", "end_date")))
+
+def string_dates_query(fields) -> dict:
+    return {"$or": [{field: {"$type": "string"}} for field in fields]}
+
+async def run_date_migration(job: dict) -> dict:
+    progress = {f"{name}_{count}": 0 for name, _ in DATE_MIGRATIONS for count in ("migrated", "failed")}
+    progress.update(job.get("progress", {}))
+    # Unparseable strings are left in place, so documents are walked in id order and the
+    # last id of each batch, not the shrinking query, is what lets a resumed job continue
+    for name, fields in DATE_MIGRATIONS:
+        collection = db[name]
+        while True:
+            after = progress.get(f"{name}_after")
+            query = string_dates_query(fields)
+            if after:
+                query["id"] = {"$gt": after}
+            docs = await collection.find(
+                query, {"_id": 1, "id": 1, **{field: 1 for field in fields}}
+            ).sort("id", ASCENDING).to_list(JOB_BATCH_SIZE)
+            if not docs:
+                break
+            operations = []
+            for doc in docs:
+                strings = {field: doc[field] for field in fields if isinstance(doc.get(field), str)}
+                converted = {}
+                for field, value in strings.items():
+                    try:
+                        converted[field] = to_bson_date(value) if value.strip() else None
+                    except ValueError:
+                        logger.warning("Leaving unparseable %s.%s %r on %s", name, field, value, doc.get("id"))
+                if len(converted) < len(strings):
+                    progress[f"{name}_failed"] += 1
+                if converted:
+                    # Matching on the old values leaves documents rewritten meanwhile untouched
+                    operations.append(UpdateOne(
+                        {"_id": doc["_id"], **{field: strings[field] for field in converted}},
+                        {"$set": converted},
+                    ))
+            if operations:
+                result = await collection.bulk_write(operations, ordered=False)
+                progress[f"{name}_migrated"] += result.modified_count
+            progress[f"{name}_after"] = docs[-1]["id"]
+            await record_job_progress(job, progress)
+            await asyncio.sleep(JOB_BATCH_PAUSE_SECONDS)
+    # Summaries keyed on the old string dates are rebuilt in their own job
+    await queue_job("day_summaries_rebuild")
+    await bump_versions("tasks", "sprints")
+    sprint_cache.invalidate_where(lambda key, value: True)
+    return progress
+
+async def run_day_summaries_rebuild(job: dict) -> dict:
+    written = await rebuild_day_summaries(job)
+    await bump_versions("tasks")
+    return {"summaries": written}
+
+async def queue_date_migration():
+    for name, fields in DATE_MIGRATIONS:
+        if await db[name].find_one(string_dates_query(fields), {"_id": 1}):
+            break
+    else:
+        return
+    await queue_job("date_migration")
+
+MISSING_PRIORITY_RANK = {"priority_rank": {"$exists": False}}
+
+async def run_priority_rank_backfill(job: dict) -> dict:
+    progress = {"tasks_ranked": 0, **job.get("progress", {})}
+    # Ranked tasks drop out of the query, so a resumed job continues where it stopped
+    while True:
+        docs = await db.tasks.find(MISSING_PRIORITY_RANK, {"_id": 1, "priority": 1}).to_list(JOB_BATCH_SIZE)
+        if not docs:
+            break
+        # A task without a valid priority reads as medium, so it is ranked as medium
+        result = await db.tasks.bulk_write([
+            UpdateOne(
+                {"_id": doc["_id"], **MISSING_PRIORITY_RANK},
+                {"$set": {"priority_rank": PRIORITY_RANK.get(doc.get("priority"), PRIORITY_RANK[TaskPriority.MEDIUM.value])}},
+            )
+            for doc in docs
+        ], ordered=False)
+        progress["tasks_ranked"] += result.modified_count
+        await record_job_progress(job, progress)
+        await asyncio.sleep(JOB_BATCH_PAUSE_SECONDS)
+    await bump_versions("tasks")
+    return progress
+
+async def queue_priority_rank_backfill():
+    # Tasks written before priority_rank existed need it to sort by priority
+    if await db.tasks.find_one(MISSING_PRIORITY_RANK, {"_id": 1}):
+        await queue_job("priority_rank_backfill")
+
+async def queue_job(job_type: str) -> str:
+    """Queue a job of this type unless one is already pending or running; returns its id."""
+    existing = await db.jobs.find_one(
+        {"type": job_type, "status": {"$in": [JobStatus.PENDING.value, JobStatus.RUNNING.value]}}, {"_id": 0, "id": 1}
+    )
+    if existing:
+        return existing["id"]
+    job = Job(type=job_type)
+    await db.jobs.insert_one(job.dict())
+    logger.info("Queued %s job %s", job_type, job.id)
+    return job.id
+
+JOB_HANDLERS = {
+    "project_delete": run_project_delete,
+    "date_migration": run_date_migration,
+    "reconcile_counters": run_counter_reconciliation,
+    "day_summaries_rebuild": run_day_summaries_rebuild,
+    "priority_rank_backfill": run_priority_rank_backfill,
+}
+
+class JobRunner:
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+
+    def start(self):
+        self._wake = asyncio.Event()
+        self._task = asyncio.create_task(self._loop())
+
+    def wake(self):
+        if self._wake:
+            self._wake.set()
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    async def _loop(self):
+        while True:
+            try:
+                job = await claim_job()
+                while job:
+                    await self._run(job)
+                    job = await claim_job()
+            except PyMongoError:
+                logger.warning("Job runner could not reach the database", exc_info=True)
+            try:
+                await asyncio.wait_for(self._wake.wait(), JOB_POLL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+
+    async def _run(self, job: dict):
+        logger.info("Running %s job %s", job["type"], job["id"])
+        try:
+            progress = await JOB_HANDLERS[job["type"]](job)
+            status, error = JobStatus.COMPLETED, None
+        except PyMongoError:
+            # Leave the job claimed; it is retried once the lease expires
+            logger.warning("Job %s interrupted by a database error", job["id"], exc_info=True)
+            return
+        except JobLeaseLost:
+            logger.warning("Job %s was taken over by another runner", job["id"])
+            return
+        except Exception as e:
+            logger.exception("Job %s failed", job["id"])
+            progress, status, error = job.get("progress", {}), JobStatus.FAILED, str(e)
+        await db.jobs.update_one({"id": job["id"], "lease_id": job.get("lease_id")}, {"$set": {
+            "status": status.value,
+            "progress": progress,
+            "error": error,
+            "lease_until": None,
+            "updated_date": datetime.utcnow(),
+        }})
+
+job_runner = JobRunner()
+
+@api_router.get("/jobs/{job_id}", response_model=Job)
+async def get_job(job_id: str):
+    job = await db.jobs.find_one({"id": job_id})
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return Job(**job)
+
+# Recurring tasks
+# A recurring task is stored once, with its rule; the task's due_date is the first
+# occurrence. Calendar views expand occurrences lazily for the requested window only,
+# and the expanded dates are cached per (task, rule version, window). Changes to a single
+# occurrence are stored sparsely in task_occurrences, one document per changed date;
+# cancelling an occurrence adds it to the rule's exceptions. Matching series are read
+# from a cursor and expanded a batch at a time, so every series in the window is included.
+RECURRING_SERIES_BATCH_SIZE = 500
+OCCURRENCE_FIELDS = ("title", "description", "status", "priority", "assigned_to", "story_points")
+occurrence_cache = ReadCache("occurrences")
+
+def add_months(day: date, months: int) -> Tuple[int, int]:
+    year, month = divmod(day.month - 1 + months, 12)
+    return day.year + year, month + 1
+
+def rule_dates(start: date, rule: Recurrence, skip_to: date, stop: date):
+    """Yield the rule's dates in order from the period containing skip_to, until stop."""
+    if rule.frequency == RecurrenceFrequency.DAILY:
+        step = timedelta(days=rule.interval)
+        day = start + step * max(0, (skip_to - start).days // rule.interval)
+        while day < stop:
+            yield day
+            day += step
+    elif rule.frequency == RecurrenceFrequency.WEEKLY:
+        weekdays = sorted(set(rule.by_weekday or [start.weekday()]))
+        first_week = start - timedelta(days=start.weekday())
+        week = first_week + timedelta(weeks=rule.interval * max(0, (skip_to - first_week).days // 7 // rule.interval))
+        while week < stop:
+            for weekday in weekdays:
+                day = week + timedelta(days=weekday)
+                if day >= start:
+                    yield day
+            week += timedelta(weeks=rule.interval)
+    else:
+        months = (skip_to.year - start.year) * 12 + skip_to.month - start.month
+        offset = max(0, months // rule.interval) * rule.interval
+        while date(*add_months(start, offset), 1) < stop:
+            try:
+                yield date(*add_months(start, offset), start.day)
+            except ValueError:
+                pass  # months without that day (e.g. the 31st) have no occurrence
+            offset += rule.interval
+
+def occurrence_dates(start: date, rule: Recurrence, window_start: date, window_end: date) -> List[date]:
+    """Occurrence dates of a series starting on start that fall in [window_start, window_end)."""
+    stop = min(window_end, rule.until + timedelta(days=1)) if rule.until else window_end
+    # count applies before exceptions are removed, as with RRULE and EXDATE, so counted
+    # rules are walked from the start; others skip straight to the window
+    skip_to = start if rule.count else max(start, window_start)
+    exceptions = set(rule.exceptions)
+    dates = []
+    for n, day in enumerate(rule_dates(start, rule, skip_to, stop)):
+        # Weekly and monthly rules yield whole periods, which can run past stop
+        if day >= stop or (rule.count and n >= rule.count):
+            break
+        if day >= window_start and day not in exceptions:
+            dates.append(day)
+    return dates
+
+def cached_occurrence_dates(task: dict, window_start: date, window_end: date) -> List[date]:
+    # updated_date changes with every edit of the rule, so stale expansions are never hit
+    key = (task["id"], task.get("updated_date"), window_start, window_end)
+    dates = occurrence_cache.get(key)
+    if dates is None:
+        dates = occurrence_dates(as_date(task["due_date"]), Recurrence(**task["recurrence"]), window_start, window_end)
+        occurrence_cache.set(key, dates)
+    return dates
+
+def recurring_query(start: date, end: date, project_id: Optional[str] = None,
+                    sprint_id: Optional[str] = None, assigned_to: Optional[str] = None) -> dict:
+    # Series that start before the window ends and have not ended before it starts
+    query = {
+        "recurrence.frequency": {"$exists": True},
+        "due_date": {"$lt": to_bson_date(end)},
+        "$or": [{"recurrence.until": None}, {"recurrence.until": {"$gte": to_bson_date(start)}}],
+    }
+    for field, value in (("project_id", project_id), ("sprint_id", sprint_id), ("assigned_to", assigned_to)):
+        if value:
+            query[field] = value
+    return query
+
+def build_occurrence(task: dict, day: date, override: Optional[dict]) -> TaskOccurrence:
+    fields = {key: value for key, value in task.items() if key != "_id"}
+    if override:
+        fields.update({field: override[field] for field in OCCURRENCE_FIELDS if field in override})
+    fields.update(id=f"{task['id']}:{day.isoformat()}", series_id=task["id"], occurrence_date=day, due_date=day)
+    return TaskOccurrence(**fields)
+
+async def expand_occurrences(series: List[dict], start: date, end: date) -> List[TaskOccurrence]:
+    dates = {task["id"]: cached_occurrence_dates(task, start, end) for task in series}
+    overrides = {}
+    if any(dates.values()):
+        async for override in reporting_db.task_occurrences.find({
+            "task_id": {"$in": [task_id for task_id, days in dates.items() if days]},
+            "date": {"$gte": to_bson_date(start), "$lt": to_bson_date(end)},
+        }, {"_id": 0}):
+            overrides[(override["task_id"], as_date(override["date"]))] = override
+    return sorted(
+        (build_occurrence(task, day, overrides.get((task["id"], day))) for task in series for day in dates[task["id"]]),
+        key=occurrence_order,
+    )
+
+def occurrence_order(occurrence: TaskOccurrence) -> tuple:
+    return occurrence.occurrence_date, occurrence.created_date
+
+async def occurrences_in(start: date, end: date, **filters) -> List[TaskOccurrence]:
+    occurrences, series = [], []
+    cursor = reporting_db.tasks.find(recurring_query(start, end, **filters), {"_id": 0})
+    async for task in cursor.batch_size(RECURRING_SERIES_BATCH_SIZE):
+        series.append(task)
+        if len(series) >= RECURRING_SERIES_BATCH_SIZE:
+            occurrences += await expand_occurrences(series, start, end)
+            series = []
+    if series:
+        occurrences += await expand_occurrences(series, start, end)
+    return sorted(occurrences, key=occurrence_order)
+
+async def forget_task_occurrences(task_ids: List[str]):
+    if task_ids:
+        await db.task_occurrences.delete_many({"task_id": {"$in": task_ids}})
+
+async def find_occurrence(task_id: str, day: date) -> dict:
+    task = await db.tasks.find_one({"id": task_id}, {"_id": 0})
+    if not task:
+        raise HTTPException(status_code=404, detail="Task not found")
+    if not task.get("recurrence") or not task.get("due_date"):
+        raise HTTPException(status_code=400, detail="Task is not recurring")
+    if not occurrence_dates(as_date(task["due_date"]), Recurrence(**task["recurrence"]), day, day + timedelta(days=1)):
+        raise HTTPException(status_code=404, detail="No occurrence on that date")
+    return task
+
+@api_router.get("/tasks/{task_id}/occurrences", response_model=List[TaskOccurrence])
+async def get_task_occurrences(task_id: str, start_date: str, end_date: str):
+    start, end = parse_calendar_date(start_date), parse_calendar_date(end_date) + timedelta(days=1)
+    if (end - start).days > MAX_RANGE_DAYS:
+        raise HTTPException(status_code=400, detail=f"Range cannot exceed {MAX_RANGE_DAYS} days")
+    task = await db.tasks.find_one({"id": task_id}, {"_id": 0})
+    if not task:
+        raise HTTPException(status_code=404, detail="Task not found")
+    if not task.get("recurrence") or not task.get("due_date"):
+        return []
+    return await expand_occurrences([task], start, end)
+
+@api_router.put("/tasks/{task_id}/occurrences/{occurrence_date}", response_model=TaskOccurrence)
+async def update_task_occurrence(task_id: str, occurrence_date: str, occurrence_update: TaskOccurrenceUpdate):
+    day = parse_calendar_date(occurrence_date)
+    task = await find_occurrence(task_id, day)
+    update_data = {
+        field: value.value if isinstance(value, Enum) else value
+        for field, value in occurrence_update.dict(exclude_unset=True).items()
+    }
+    override = await db.task_occurrences.find_one_and_update(
+        {"task_id": task_id, "date": to_bson_date(day)},
+        {"$set": {**update_data, "updated_date": datetime.utcnow()}},
+        upsert=True, return_document=ReturnDocument.AFTER,
+    )
+    await bump_versions("tasks")
+    return build_occurrence(task, day, override)
+
+@api_router.delete("/tasks/{task_id}/occurrences/{occurrence_date}")
+async def cancel_task_occurrence(task_id: str, occurrence_date: str):
+    day = parse_calendar_date(occurrence_date)
+    await find_occurrence(task_id, day)
+    await db.tasks.update_one(
+        {"id": task_id},
+        {"$addToSet": {"recurrence.exceptions": to_bson_date(day)}, "$set": {"updated_date": datetime.utcnow()}},
+    )
+    await db.task_occurrences.delete_one({"task_id": task_id, "date": to_bson_date(day)})
+    await bump_versions("tasks")
+    return {"message": "Occurrence cancelled"}
+
 # Week calendar endpoint
-@api_router.get("/calendar/week")
-async def get_week_calendar(start_date: str):
-    # Parse start_date and get tasks for the week
+def parse_calendar_date(value: str) -> date:
     try:
-        week_start = datetime.strptime(start_date, "%Y-%m-%d").date()
+        return datetime.strptime(value, "%Y-%m-%d").date()
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
+
+def calendar_query(start: date, end: date, project_id: Optional[str] = None,
+                   sprint_id: Optional[str] = None, assigned_to: Optional[str] = None) -> dict:
+    # Tasks due in [start, end); recurring tasks are expanded separately
+    query = {"due_date": {"$gte": to_bson_date(start), "$lt": to_bson_date(end)}, "recurrence": None}
+    if project_id:
+        query["project_id"] = project_id
+    if sprint_id:
+        query["sprint_id"] = sprint_id
+    if assigned_to:
+        query["assigned_to"] = assigned_to
+    return query
+
+def day_bucket_group(key="$due_date", with_tasks: bool = True) -> dict:
+    # One $group per day computing totals plus count/story points per status and priority
+    group = {
+        "_id": key,
+        "count": {"$sum": 1},
+        "story_points": {"$sum": {"$ifNull": ["$story_points", 0]}},
+    }
+    for field, values in (("status", TaskStatus), ("priority", TaskPriority)):
+        for value in values:
+            is_value = {"$eq": [f"${field}", value.value]}
+            group[f"{field}:{value.value}:count"] = {"$sum": {"$cond": [is_value, 1, 0]}}
+            group[f"{field}:{value.value}:story_points"] = {
+                "$sum": {"$cond": [is_value, {"$ifNull": ["$story_points", 0]}, 0]}
+            }
+    if with_tasks:
+        group["tasks"] = {"$push": "$$ROOT"}
+    return group
+
+def empty_day_bucket(day: date) -> dict:
+    return {
+        "date": day.isoformat(),
+        "count": 0,
+        "story_points": 0,
+        "by_status": {s.value: {"count": 0, "story_points": 0} for s in TaskStatus},
+        "by_priority": {p.value: {"count": 0, "story_points": 0} for p in TaskPriority},
+        "tasks": [],
+    }
+
+def bucket_from_group(day: date, doc: dict) -> dict:
+    bucket = empty_day_bucket(day)
+    bucket["count"] = doc["count"]
+    bucket["story_points"] = doc["story_points"]
+    for field in ("status", "priority"):
+        for value, totals in bucket[f"by_{field}"].items():
+            totals["count"] = doc[f"{field}:{value}:count"]
+            totals["story_points"] = doc[f"{field}:{value}:story_points"]
+    return bucket
+
+def add_occurrences(buckets: dict, occurrences: List[TaskOccurrence], with_tasks: bool = True):
+    for occurrence in occurrences:
+        day = occurrence.occurrence_date
+        bucket = buckets.setdefault(day.isoformat(), empty_day_bucket(day))
+        points = occurrence.story_points or 0
+        for totals in (bucket, bucket["by_status"][occurrence.status.value], bucket["by_priority"][occurrence.priority.value]):
+            totals["count"] += 1
+            totals["story_points"] += points
+        if with_tasks:
+            bucket["tasks"].append(occurrence)
+
+def fill_days(start: date, end: date, buckets: dict, with_tasks: bool = True) -> List[dict]:
+    days = []
+    day = start
+    while day < end:
+        bucket = buckets.get(day.isoformat()) or empty_day_bucket(day)
+        if not with_tasks:
+            bucket.pop("tasks", None)
+        days.append(bucket)
+        day += timedelta(days=1)
+    return days
+
+async def calendar_day_buckets(start: date, end: date, with_tasks: bool = True, **filters) -> List[dict]:
+    pipeline = [
+        {"$match": calendar_query(start, end, **filters)},
+        {"$sort": {"created_date": 1}},
+        {"$project": {"_id": 0}},
+        {"$group": day_bucket_group(with_tasks=with_tasks)},
+    ]
+    buckets = {}
+    async for doc in reporting_db.tasks.aggregate(pipeline):
+        bucket = bucket_from_group(doc["_id"].date(), doc)
+        if with_tasks:
+            bucket["tasks"] = [Task(**task) for task in doc["tasks"]]
+        buckets[bucket["date"]] = bucket
+    add_occurrences(buckets, await occurrences_in(start, end, **filters), with_tasks)
+    return fill_days(start, end, buckets, with_tasks)
+
+@api_router.get("/calendar/week")
+async def get_week_calendar(request: Request, response: Response, start_date: str,
+                            project_id: Optional[str] = None, sprint_id: Optional[str] = None,
+                            assigned_to: Optional[str] = None):
+    # Parse start_date and get tasks for the week
+    week_start = parse_calendar_date(start_date)
+    week_end = week_start + timedelta(days=7)
+    not_modified = await reporting_conditional_get(request, response, "tasks")
+    if not_modified:
+        return not_modified
     
-    # Get all tasks for the week
-    tasks = await db.tasks.find({
-        "due_date": {
-            "$gte": week_start.isoformat(),
-            "$lt": (week_start.replace(day=week_start.day + 7)).isoformat()
-        }
-    }).to_list(1000)
+    # Same aggregation as /calendar/week/days, flattened to one list in day order
+    days = await calendar_day_buckets(
+        week_start, week_end, project_id=project_id, sprint_id=sprint_id, assigned_to=assigned_to
+    )
     
     return {
         "week_start": week_start.isoformat(),
-        "tasks": [Task(**task) for task in tasks]
+        "tasks": [task for day in days for task in day["tasks"]]
+    }
+
+@api_router.get("/calendar/week/days")
+async def get_week_calendar_days(request: Request, response: Response, start_date: str,
+                                 project_id: Optional[str] = None, sprint_id: Optional[str] = None,
+                                 assigned_to: Optional[str] = None):
+    # Same week as /calendar/week, bucketed by day with per-day totals
+    week_start = parse_calendar_date(start_date)
+    week_end = week_start + timedelta(days=7)
+    not_modified = await reporting_conditional_get(request, response, "tasks")
+    if not_modified:
+        return not_modified
+    days = await calendar_day_buckets(
+        week_start, week_end, project_id=project_id, sprint_id=sprint_id, assigned_to=assigned_to
+    )
+    return {
+        "week_start": week_start.isoformat(),
+        "week_end": week_end.isoformat(),
+        "count": sum(day["count"] for day in days),
+        "story_points": sum(day["story_points"] for day in days),
+        "days": days,
+    }
+
+# Sprint analytics
+# Burndown, velocity and cycle time are computed by aggregation pipelines, so only
+# per-day and per-group totals leave the server. A done task's cycle time runs from
+# created_date to its last move to done; that and the time spent in each status come
+# from the task event log. $dateTrunc needs MongoDB 5.0 and $percentile 7.0.
+MAX_VELOCITY_SPRINTS = 50
+HOUR_MILLISECONDS = 60 * 60 * 1000
+PERCENTILES = (0.5, 0.85, 0.95)
+
+def story_points_sum(condition=None) -> dict:
+    points = {"$ifNull": ["$story_points", 0]}
+    return {"$sum": {"$cond": [condition, points, 0]} if condition else points}
+
+def count_sum(condition=None) -> dict:
+    return {"$sum": {"$cond": [condition, 1, 0]} if condition else 1}
+
+IS_DONE = {"$eq": ["$status", TaskStatus.DONE.value]}
+
+def completion_stages() -> List[dict]:
+    """Stages setting completed_date on done tasks: when each last moved to done.
+
+    Later edits to a done task do not move its completion. Tasks completed before the
+    event log existed have no such event and fall back to their updated_date.
+    """
+    return [
+        {"$lookup": {
+            "from": "task_events",
+            "localField": "id",
+            "foreignField": "task_id",
+            "pipeline": [
+                {"$match": {
+                    "status": TaskStatus.DONE.value,
+                    "$or": [{"type": TaskEventType.CREATED.value}, {"changes.status": {"$exists": True}}],
+                }},
+                {"$group": {"_id": None, "completed_date": {"$max": "$created_date"}}},
+            ],
+            "as": "completion",
+        }},
+        {"$set": {"completed_date": {"$ifNull": [{"$first": "$completion.completed_date"}, "$updated_date"]}}},
+    ]
+
+def hours_between(start: str, end: str) -> dict:
+    return {"$divide": [{"$subtract": [end, start]}, HOUR_MILLISECONDS]}
+
+def hours_summary_group(key, hours: dict) -> dict:
+    return {
+        "_id": key,
+        "tasks": {"$sum": 1},
+        "mean_hours": {"$avg": hours},
+        "percentiles": {"$percentile": {"input": hours, "p": list(PERCENTILES), "method": "approximate"}},
+    }
+
+def hours_summary(doc: Optional[dict]) -> dict:
+    if not doc:
+        return {"tasks": 0, "mean_hours": None, "p50_hours": None, "p85_hours": None, "p95_hours": None}
+    p50, p85, p95 = doc["percentiles"]
+    return {
+        "tasks": doc["tasks"],
+        "mean_hours": round(doc["mean_hours"], 2),
+        "p50_hours": round(p50, 2),
+        "p85_hours": round(p85, 2),
+        "p95_hours": round(p95, 2),
+    }
+
+@api_router.get("/analytics/sprints/{sprint_id}/burndown")
+async def get_sprint_burndown(sprint_id: str):
+    sprint = await db.sprints.find_one({"id": sprint_id})
+    if not sprint:
+        raise HTTPException(status_code=404, detail="Sprint not found")
+    sprint_obj = Sprint(**sprint)
+    start = sprint_obj.start_date or sprint_obj.created_date.date()
+    end = sprint_obj.end_date or datetime.utcnow().date()
+    if end < start:
+        raise HTTPException(status_code=400, detail="Sprint ends before it starts")
+    
+    totals = await reporting_db.tasks.aggregate([
+        {"$match": {"sprint_id": sprint_id}},
+        {"$group": {"_id": None, "points": story_points_sum(), "tasks": count_sum()}},
+    ]).to_list(1)
+    committed = totals[0] if totals else {"points": 0, "tasks": 0}
+    await task_event_log.flush()
+    # Work finished before the sprint started counts on its first day
+    completed_before = {"points": 0, "tasks": 0}
+    completed_by_day = {}
+    async for doc in reporting_db.tasks.aggregate([
+        {"$match": {"sprint_id": sprint_id, "status": TaskStatus.DONE.value}},
+        *completion_stages(),
+        {"$group": {
+            "_id": {"$dateTrunc": {"date": "$completed_date", "unit": "day"}},
+            "points": story_points_sum(),
+            "tasks": count_sum(),
+        }},
+    ]):
+        day = doc["_id"].date()
+        completed = completed_before if day < start else completed_by_day.setdefault(day, {"points": 0, "tasks": 0})
+        completed["points"] += doc["points"]
+        completed["tasks"] += doc["tasks"]
+    
+    length = (end - start).days
+    days = []
+    completed_points, completed_tasks = completed_before["points"], completed_before["tasks"]
+    for offset in range(length + 1):
+        day = start + timedelta(days=offset)
+        completed = completed_by_day.get(day, {"points": 0, "tasks": 0})
+        completed_points += completed["points"]
+        completed_tasks += completed["tasks"]
+        days.append({
+            "date": day.isoformat(),
+            "completed_points": completed["points"],
+            "remaining_points": committed["points"] - completed_points,
+            "remaining_tasks": committed["tasks"] - completed_tasks,
+            "ideal_points": round(committed["points"] * (1 - offset / length), 2) if length else 0,
+        })
+    return {
+        "sprint_id": sprint_id,
+        "start_date": start.isoformat(),
+        "end_date": end.isoformat(),
+        "committed_points": committed["points"],
+        "committed_tasks": committed["tasks"],
+        "days": days,
+    }
+
+@api_router.get("/analytics/projects/{project_id}/velocity")
+async def get_project_velocity(project_id: str, sprints: int = Query(6, ge=1, le=MAX_VELOCITY_SPRINTS)):
+    recent = await reporting_db.sprints.find(
+        {"project_id": project_id}, {"_id": 0, "id": 1, "name": 1, "status": 1, "start_date": 1, "end_date": 1}
+    ).sort([("start_date", -1), ("created_date", -1)]).to_list(sprints)
+    totals = {}
+    async for doc in reporting_db.tasks.aggregate([
+        {"$match": {"sprint_id": {"$in": [sprint["id"] for sprint in recent]}}},
+        {"$group": {
+            "_id": "$sprint_id",
+            "committed_points": story_points_sum(),
+            "completed_points": story_points_sum(IS_DONE),
+            "committed_tasks": count_sum(),
+            "completed_tasks": count_sum(IS_DONE),
+        }},
+    ]):
+        totals[doc.pop("_id")] = doc
+    
+    empty = {"committed_points": 0, "completed_points": 0, "committed_tasks": 0, "completed_tasks": 0}
+    # Oldest first, as velocity charts read left to right
+    rows = [
+        {**sprint, "start_date": as_date(sprint.get("start_date")), "end_date": as_date(sprint.get("end_date")),
+         **totals.get(sprint["id"], empty)}
+        for sprint in reversed(recent)
+    ]
+    completed = np.array([row["completed_points"] for row in rows], dtype=float)
+    return {
+        "project_id": project_id,
+        "sprints": rows,
+        "average_velocity": round(float(completed.mean()), 2) if completed.size else 0.0,
+        "velocity_stddev": round(float(completed.std()), 2) if completed.size else 0.0,
+    }
+
+async def time_in_status(query: dict) -> dict:
+    """Closed status intervals per status, from status-changing task events."""
+    await task_event_log.flush()
+    query = {**query, "$or": [
+        {"type": {"$in": [TaskEventType.CREATED.value, TaskEventType.DELETED.value]}},
+        {"changes.status": {"$exists": True}},
+    ]}
+    summaries = {}
+    # An interval runs from an event to the next event of the same task
+    async for doc in reporting_db.task_events.aggregate([
+        {"$match": query},
+        {"$setWindowFields": {
+            "partitionBy": "$task_id",
+            "sortBy": {"created_date": 1},
+            "output": {"next_date": {"$shift": {"output": "$created_date", "by": 1}}},
+        }},
+        {"$match": {"next_date": {"$ne": None}, "type": {"$ne": TaskEventType.DELETED.value}}},
+        {"$group": hours_summary_group("$status", hours_between("$created_date", "$next_date"))},
+    ]):
+        summaries[doc["_id"]] = doc
+    return {status.value: hours_summary(summaries.get(status.value)) for status in TaskStatus}
+
+@api_router.get("/analytics/cycle-time")
+async def get_cycle_time(project_id: Optional[str] = None, sprint_id: Optional[str] = None):
+    query = {}
+    if project_id:
+        query["project_id"] = project_id
+    if sprint_id:
+        query["sprint_id"] = sprint_id
+    await task_event_log.flush()
+    hours = hours_between("$created_date", "$completed_date")
+    # Tasks without a priority read as medium
+    priority = {"$toLower": {"$ifNull": ["$priority", TaskPriority.MEDIUM.value]}}
+    facets = await reporting_db.tasks.aggregate([
+        {"$match": {**query, "status": TaskStatus.DONE.value}},
+        *completion_stages(),
+        {"$facet": {
+            "overall": [{"$group": hours_summary_group(None, hours)}],
+            "by_priority": [{"$group": hours_summary_group(priority, hours)}],
+        }},
+    ]).to_list(1)
+    overall = facets[0]["overall"] if facets else []
+    by_priority = {doc["_id"]: doc for doc in facets[0]["by_priority"]} if facets else {}
+    
+    return {
+        "overall": hours_summary(overall[0] if overall else None),
+        "by_priority": {value.value: hours_summary(by_priority.get(value.value)) for value in TaskPriority},
+        "time_in_status": await time_in_status(query),
+    }
+
+# Calendar day summaries
+# day_summaries holds one document per (due date, project) with the same totals as a
+# day bucket. Task writes keep it current with $inc, so range views read one small
+# document per day and project instead of scanning every task in the range. A rebuild
+# overwrites each summary in place rather than emptying the collection, so range views
+# and concurrent $inc writes keep working while it runs.
+MAX_RANGE_DAYS = 366
+
+class CalendarView(str, Enum):
+    MONTH = "month"
+    QUARTER = "quarter"
+
+def day_summary_increments(task: dict, sign: int, increments: dict):
+    if not task.get("due_date") or task.get("recurrence"):
+        return
+    key = (stored_date(task["due_date"]), task.get("project_id"))
+    if key[0] is None:
+        return
+    story_points = (task.get("story_points") or 0) * sign
+    status, priority = TaskStatus(task["status"]).value, TaskPriority(task["priority"]).value
+    inc = increments.setdefault(key, {})
+    for path, value in (
+        ("count", sign),
+        ("story_points", story_points),
+        (f"by_status.{status}.count", sign),
+        (f"by_status.{status}.story_points", story_points),
+        (f"by_priority.{priority}.count", sign),
+        (f"by_priority.{priority}.story_points", story_points),
+    ):
+        inc[path] = inc.get(path, 0) + value
+
+async def apply_day_summary_changes(before: List[dict], after: List[dict]):
+    """Move the given task states out of (before) and into (after) the day summaries."""
+    increments = {}
+    for task in before:
+        day_summary_increments(task, -1, increments)
+    for task in after:
+        day_summary_increments(task, 1, increments)
+    operations = []
+    for (day, project_id), inc in increments.items():
+        inc = {path: value for path, value in inc.items() if value}
+        if inc:
+            operations.append(UpdateOne(
+                {"date": day, "project_id": project_id},
+                {"$inc": inc, "$set": {"updated_date": datetime.utcnow()}},
+                upsert=True,
+            ))
+    if operations:
+        await db.day_summaries.bulk_write(operations, ordered=False)
+
+async def rebuild_day_summaries(job: Optional[dict] = None) -> int:
+    """Recompute day_summaries from the tasks collection, renewing the job's lease as it goes."""
+    pipeline = [
+        {"$match": {"due_date": {"$ne": None}, "recurrence": None}},
+        {"$group": day_bucket_group({"date": "$due_date", "project_id": "$project_id"}, with_tasks=False)},
+    ]
+    started, rebuild_id = datetime.utcnow(), str(uuid.uuid4())
+    batch, written = [], 0
+    async for doc in db.tasks.aggregate(pipeline):
+        day = stored_date(doc["_id"]["date"])
+        if day is None:
+            continue
+        bucket = bucket_from_group(day.date(), doc)
+        bucket.pop("tasks")
+        bucket.pop("date")
+        bucket["rebuild_id"] = rebuild_id
+        bucket["updated_date"] = datetime.utcnow()
+        batch.append(UpdateOne({"date": day, "project_id": doc["_id"].get("project_id")}, {"$set": bucket}, upsert=True))
+        if len(batch) >= STREAM_BATCH_SIZE:
+            await db.day_summaries.bulk_write(batch, ordered=False)
+            written, batch = written + len(batch), []
+            if job and not await record_job_progress(job, {"summaries": written}):
+                raise JobLeaseLost(job["id"])
+    if batch:
+        await db.day_summaries.bulk_write(batch, ordered=False)
+        written += len(batch)
+    # A runner that took over the job owns the cleanup; deleting here would drop its rows
+    if job and not await record_job_progress(job, {"summaries": written}):
+        raise JobLeaseLost(job["id"])
+    # Days that no longer have tasks; summaries written since the rebuild started are kept
+    await db.day_summaries.delete_many({"rebuild_id": {"$ne": rebuild_id}, "updated_date": {"$not": {"$gte": started}}})
+    return written
+
+def calendar_range(start_date: str, end_date: Optional[str], view: Optional[CalendarView]):
+    """Resolve the [start, end) window for a range view."""
+    start = parse_calendar_date(start_date)
+    if view == CalendarView.MONTH:
+        start = start.replace(day=1)
+        end = (start + timedelta(days=32)).replace(day=1)
+    elif view == CalendarView.QUARTER:
+        start = start.replace(month=(start.month - 1) // 3 * 3 + 1, day=1)
+        end = start
+        for _ in range(3):
+            end = (end + timedelta(days=32)).replace(day=1)
+    elif end_date:
+        # end_date is inclusive
+        end = parse_calendar_date(end_date) + timedelta(days=1)
+    else:
+        raise HTTPException(status_code=400, detail="Provide end_date or view")
+    if end <= start:
+        raise HTTPException(status_code=400, detail="end_date must not be before start_date")
+    if (end - start).days > MAX_RANGE_DAYS:
+        raise HTTPException(status_code=400, detail=f"Range cannot exceed {MAX_RANGE_DAYS} days")
+    return start, end
+
+@api_router.get("/calendar/range")
+async def get_range_calendar(request: Request, response: Response, start_date: str,
+                             end_date: Optional[str] = None, view: Optional[CalendarView] = None,
+                             project_id: Optional[str] = None, sprint_id: Optional[str] = None,
+                             assigned_to: Optional[str] = None):
+    start, end = calendar_range(start_date, end_date, view)
+    not_modified = await reporting_conditional_get(request, response, "tasks")
+    if not_modified:
+        return not_modified
+    if sprint_id or assigned_to:
+        # Summaries are kept per project only; narrower filters aggregate the tasks
+        days = await calendar_day_buckets(
+            start, end, with_tasks=False, project_id=project_id, sprint_id=sprint_id, assigned_to=assigned_to
+        )
+    else:
+        query = {"date": {"$gte": to_bson_date(start), "$lt": to_bson_date(end)}}
+        if project_id:
+            query["project_id"] = project_id
+        buckets = {}
+        async for summary in reporting_db.day_summaries.find(query, {"_id": 0}):
+            day = summary["date"].date()
+            bucket = buckets.setdefault(day.isoformat(), empty_day_bucket(day))
+            bucket["count"] += summary.get("count", 0)
+            bucket["story_points"] += summary.get("story_points", 0)
+            for field in ("by_status", "by_priority"):
+                for value, totals in summary.get(field, {}).items():
+                    bucket[field][value]["count"] += totals.get("count", 0)
+                    bucket[field][value]["story_points"] += totals.get("story_points", 0)
+        # Recurring tasks are not in the summaries; their occurrences are expanded here
+        add_occurrences(buckets, await occurrences_in(start, end, project_id=project_id), with_tasks=False)
+        days = fill_days(start, end, buckets, with_tasks=False)
+    return {
+        "start_date": start.isoformat(),
+        "end_date": (end - timedelta(days=1)).isoformat(),
+        "count": sum(day["count"] for day in days),
+        "story_points": sum(day["story_points"] for day in days),
+        "days": days,
+    }
+
+@api_router.post("/calendar/summaries/rebuild", status_code=202)
+async def rebuild_calendar_summaries():
+    job_id = await queue_job("day_summaries_rebuild")
+    job_runner.wake()
+    return {"message": "Day summary rebuild started", "job_id": job_id}
+
+# Workload
+# Open (not done) tasks per assignee, bucketed by day or by week from the range start,
+# come from one aggregation over the assignee_due index; recurring occurrences are added
+# like in the calendar. Buckets are sparse: only periods with work are returned. An
+# assignee's optional weekly capacity is prorated to the bucket length, and buckets
+# holding more story points than that are flagged as over capacity.
+DAY_MILLISECONDS = 24 * 60 * 60 * 1000
+
+class WorkloadGranularity(str, Enum):
+    DAY = "day"
+    WEEK = "week"
+
+WORKLOAD_BUCKET_DAYS = {WorkloadGranularity.DAY: 1, WorkloadGranularity.WEEK: 7}
+
+def bucket_capacity(weekly_capacity: Optional[int], days: int) -> Optional[float]:
+    return None if weekly_capacity is None else round(weekly_capacity * days / 7, 2)
+
+@api_router.get("/workload")
+async def get_workload(request: Request, response: Response, start_date: str,
+                       end_date: Optional[str] = None, view: Optional[CalendarView] = None,
+                       granularity: WorkloadGranularity = WorkloadGranularity.WEEK,
+                       project_id: Optional[str] = None, sprint_id: Optional[str] = None,
+                       assigned_to: Optional[List[str]] = Query(None)):
+    start, end = calendar_range(start_date, end_date, view)
+    not_modified = await reporting_conditional_get(request, response, "tasks", "assignees")
+    if not_modified:
+        return not_modified
+    bucket_days = WORKLOAD_BUCKET_DAYS[granularity]
+    query = calendar_query(start, end, project_id, sprint_id)
+    query["status"] = {"$ne": TaskStatus.DONE.value}
+    query["assigned_to"] = {"$in": assigned_to} if assigned_to else {"$nin": [None, ""]}
+    totals = {}
+    async for doc in reporting_db.tasks.aggregate([
+        {"$match": query},
+        {"$group": {
+            "_id": {
+                "assignee": "$assigned_to",
+                "bucket": {"$floor": {"$divide": [
+                    {"$subtract": ["$due_date", to_bson_date(start)]}, bucket_days * DAY_MILLISECONDS
+                ]}},
+            },
+            "tasks": count_sum(),
+            "story_points": story_points_sum(),
+        }},
+    ]):
+        totals[(doc["_id"]["assignee"], int(doc["_id"]["bucket"]))] = [doc["tasks"], doc["story_points"]]
+    occurrences = await occurrences_in(
+        start, end, project_id=project_id, sprint_id=sprint_id,
+        assigned_to=assigned_to[0] if assigned_to and len(assigned_to) == 1 else None,
+    )
+    for occurrence in occurrences:
+        if occurrence.status == TaskStatus.DONE or not occurrence.assigned_to:
+            continue
+        if assigned_to and occurrence.assigned_to not in assigned_to:
+            continue
+        bucket = totals.setdefault(
+            (occurrence.assigned_to, (occurrence.occurrence_date - start).days // bucket_days), [0, 0]
+        )
+        bucket[0] += 1
+        bucket[1] += occurrence.story_points or 0
+
+    names = sorted({name for name, _ in totals})
+    capacities = {}
+    async for doc in reporting_db.assignees.find({"name": {"$in": names}}, {"_id": 0, "name": 1, "weekly_capacity": 1}):
+        capacities[doc["name"]] = doc.get("weekly_capacity")
+    rows = {
+        name: {
+            "assignee": name,
+            "weekly_capacity": capacities.get(name),
+            "tasks": 0,
+            "story_points": 0,
+            "capacity": bucket_capacity(capacities.get(name), (end - start).days),
+            "over_capacity": False,
+            "buckets": [],
+        }
+        for name in names
     }
+    for (name, index), (tasks, story_points) in sorted(totals.items()):
+        bucket_start = start + timedelta(days=index * bucket_days)
+        capacity = bucket_capacity(capacities.get(name), min(bucket_days, (end - bucket_start).days))
+        over_capacity = capacity is not None and story_points > capacity
+        row = rows[name]
+        row["tasks"] += tasks
+        row["story_points"] += story_points
+        row["over_capacity"] = row["over_capacity"] or over_capacity
+        row["buckets"].append({
+            "start_date": bucket_start.isoformat(),
+            "tasks": tasks,
+            "story_points": story_points,
+            "capacity": capacity,
+            "over_capacity": over_capacity,
+        })
+    # A quarter for thousands of assignees is a large report of plain values; encode it
+    # straight to JSON bytes, carrying the ETag over as json_rows does
+    return ORJSONResponse({
+        "start_date": start.isoformat(),
+        "end_date": (end - timedelta(days=1)).isoformat(),
+        "granularity": granularity.value,
+        "assignees": list(rows.values()),
+    }, headers=dict(response.headers))
+
+@api_router.get("/assignees", response_model=List[Assignee])
+async def get_assignees():
+    return [Assignee(**doc) for doc in await db.assignees.find({}, {"_id": 0}).sort("name", ASCENDING).to_list(None)]
+
+@api_router.put("/assignees/{name}", response_model=Assignee)
+async def update_assignee(name: str, assignee_update: AssigneeUpdate):
+    assignee = Assignee(name=name, **assignee_update.dict())
+    await db.assignees.replace_one({"name": name}, assignee.dict(), upsert=True)
+    await bump_versions("assignees")
+    return assignee
+
+@api_router.delete("/assignees/{name}")
+async def delete_assignee(name: str):
+    result = await db.assignees.delete_one({"name": name})
+    if result.deleted_count == 0:
+        raise HTTPException(status_code=404, detail="Assignee not found")
+    await bump_versions("assignees")
+    return {"message": "Assignee deleted successfully"}
+
+# Index management
+# Declared index spec per collection. Every lookup filters on the application-level
+# `id` (not `_id`), so each collection needs its own unique index on it.
+INDEX_SPECS = {
+    "tasks": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("project_id", ASCENDING), ("sprint_id", ASCENDING)], name="project_sprint"),
+        IndexModel([("due_date", ASCENDING)], name="due_date"),
+        # Keyset pagination: the filter fields followed by PAGE_SORT
+        IndexModel(PAGE_SORT, name="page"),
+        IndexModel([("project_id", ASCENDING)] + PAGE_SORT, name="project_page"),
+        IndexModel([("sprint_id", ASCENDING)] + PAGE_SORT, name="sprint_page"),
+        IndexModel([("updated_date", ASCENDING), ("id", ASCENDING)], name="updated"),
+        IndexModel([("project_id", ASCENDING), ("updated_date", ASCENDING)], name="project_updated"),
+        # Filtered and sorted board queries
+        IndexModel([("project_id", ASCENDING), ("priority_rank", ASCENDING), ("id", ASCENDING)], name="project_priority"),
+        IndexModel([("project_id", ASCENDING), ("due_date", ASCENDING), ("id", ASCENDING)], name="project_due"),
+        IndexModel([("assigned_to", ASCENDING), ("due_date", ASCENDING)], name="assignee_due"),
+        IndexModel([("status", ASCENDING), ("due_date", ASCENDING)], name="status_due"),
+        # Recurring series overlapping a calendar window; only recurring tasks are indexed
+        IndexModel(
+            [("recurrence.until", ASCENDING), ("due_date", ASCENDING)], name="recurring_window",
+            partialFilterExpression={"recurrence.frequency": {"$exists": True}},
+        ),
+        IndexModel(
+            [("title", TEXT), ("description", TEXT)], name="text",
+            weights={"title": 10, "description": 1}, default_language="english",
+        ),
+    ],
+    "projects": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel(PAGE_SORT, name="page"),
+        IndexModel([("updated_date", ASCENDING)], name="updated"),
+    ],
+    "sprints": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("project_id", ASCENDING)] + PAGE_SORT, name="project_page"),
+        IndexModel(PAGE_SORT, name="page"),
+        IndexModel([("updated_date", ASCENDING)], name="updated"),
+    ],
+    "task_tombstones": [
+        IndexModel(
+            [("deleted_date", ASCENDING)], name="deleted_ttl",
+            expireAfterSeconds=TASK_TOMBSTONE_RETENTION_DAYS * 24 * 3600,
+        ),
+        IndexModel([("project_id", ASCENDING), ("deleted_date", ASCENDING)], name="project_deleted"),
+    ],
+    "task_occurrences": [
+        IndexModel([("task_id", ASCENDING), ("date", ASCENDING)], name="task_date_unique", unique=True),
+    ],
+    "jobs": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("status", ASCENDING), ("created_date", ASCENDING)], name="status_created"),
+    ],
+    "task_events": [
+        IndexModel(PAGE_SORT, name="page"),
+        IndexModel([("task_id", ASCENDING)] + PAGE_SORT, name="task_page"),
+        IndexModel([("project_id", ASCENDING)] + PAGE_SORT, name="project_page"),
+        IndexModel([("sprint_id", ASCENDING)] + PAGE_SORT, name="sprint_page"),
+    ],
+    "assignees": [
+        IndexModel([("name", ASCENDING)], name="name_unique", unique=True),
+    ],
+    "day_summaries": [
+        IndexModel([("date", ASCENDING), ("project_id", ASCENDING)], name="date_project_unique", unique=True),
+        IndexModel([("project_id", ASCENDING), ("date", ASCENDING)], name="project_date"),
+    ],
+}
+
+def _index_signature(spec: dict) -> dict:
+    key = dict(spec["key"])
+    if "_fts" in key or TEXT in key.values():
+        # Mongo reports text indexes as {_fts: "text", _ftsx: 1}; compare their weights
+        weights = spec.get("weights") or {field: 1 for field, kind in key.items() if kind == TEXT}
+        return {"text_weights": dict(weights), "default_language": spec.get("default_language", "english")}
+    return {
+        "key": [(field, int(direction)) for field, direction in key.items()],
+        "unique": bool(spec.get("unique", False)),
+        "expireAfterSeconds": spec.get("expireAfterSeconds"),
+        "partialFilterExpression": dict(spec.get("partialFilterExpression") or {}),
+    }
+
+async def check_indexes() -> dict:
+    """Compare the indexes present in Mongo against INDEX_SPECS.
+
+    Returns a report per collection listing missing, mismatched (same name, different
+    keys or options) and undeclared indexes.
+    """
+    report = {}
+    for collection_name, models in INDEX_SPECS.items():
+        existing = await db[collection_name].index_information()
+        existing.pop("_id_", None)
+        declared = {model.document["name"]: model.document for model in models}
+        missing, mismatched = [], []
+        for name, spec in declared.items():
+            if name not in existing:
+                missing.append(name)
+            elif _index_signature(spec) != _index_signature(existing[name]):
+                mismatched.append(name)
+        report[collection_name] = {
+            "missing": missing,
+            "mismatched": mismatched,
+            "undeclared": sorted(set(existing) - set(declared)),
+        }
+    return report
+
+async def ensure_indexes() -> dict:
+    """Create any missing declared indexes and log drift. Never drops indexes."""
+    report = await check_indexes()
+    for collection_name, drift in report.items():
+        to_create = [m for m in INDEX_SPECS[collection_name] if m.document["name"] in drift["missing"]]
+        if to_create:
+            try:
+                await db[collection_name].create_indexes(to_create)
+                logger.info("Created indexes on %s: %s", collection_name, drift["missing"])
+            except OperationFailure as e:
+                logger.error("Failed to create indexes on %s: %s", collection_name, e)
+        if drift["mismatched"]:
+            logger.warning("Index drift on %s, definitions differ from spec: %s", collection_name, drift["mismatched"])
+        if drift["undeclared"]:
+            logger.warning("Undeclared indexes on %s: %s", collection_name, drift["undeclared"])
+    return await check_indexes()
+
+@api_router.get("/indexes")
+async def get_index_report():
+    return await check_indexes()
+
+# Real-time events
+# GET /api/events is a Server-Sent Events stream of task, project and sprint changes,
+# optionally scoped to a project or sprint. One broadcaster per process reads a Mongo
+# change stream (or polls updated_date on standalone servers, where change streams are
+# unavailable) and fans events out to per-connection bounded queues. A client that
+# falls behind has its backlog dropped and receives a `resync` event instead, so a slow
+# connection never grows memory past EVENTS_QUEUE_SIZE messages.
+EVENTS_QUEUE_SIZE = int(os.environ.get('EVENTS_QUEUE_SIZE', '256'))
+EVENTS_POLL_SECONDS = float(os.environ.get('EVENTS_POLL_SECONDS', '1'))
+EVENTS_KEEPALIVE_SECONDS = 15
+EVENT_SOURCES = {"tasks": ("task", Task), "projects": ("project", Project), "sprints": ("sprint", Sprint)}
+
+def sse_message(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+class EventSubscriber:
+    def __init__(self, project_id: Optional[str], sprint_id: Optional[str]):
+        self.project_id = project_id
+        self.sprint_id = sprint_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=EVENTS_QUEUE_SIZE)
+        self.dropped = 0
+
+    def wants(self, event: dict) -> bool:
+        if self.project_id and event["project_id"] != self.project_id:
+            return False
+        if self.sprint_id and event["sprint_id"] != self.sprint_id:
+            return False
+        return True
+
+    def offer(self, message: str):
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # Not keeping up: drop the backlog and ask the client to refetch
+            while not self.queue.empty():
+                self.queue.get_nowait()
+                self.dropped += 1
+            self.queue.put_nowait(sse_message("resync", {"dropped": self.dropped}))
+
+class ChangeBroadcaster:
+    def __init__(self):
+        self.subscribers = set()
+        self.mode: Optional[str] = None
+        self.published = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def subscribe(self, project_id: Optional[str] = None, sprint_id: Optional[str] = None) -> EventSubscriber:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        subscriber = EventSubscriber(project_id, sprint_id)
+        self.subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: EventSubscriber):
+        self.subscribers.discard(subscriber)
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    def publish(self, event: dict):
+        # Serialized once, shared by every subscriber queue
+        message = sse_message(event["type"], event)
+        self.published += 1
+        for subscriber in list(self.subscribers):
+            if subscriber.wants(event):
+                subscriber.offer(message)
+
+    @staticmethod
+    def upsert_event(collection_name: str, doc: dict) -> dict:
+        kind, model = EVENT_SOURCES[collection_name]
+        # A project marked for background deletion is reported as deleted
+        deleted = bool(doc.get("deleted_date"))
+        return {
+            "type": kind,
+            "op": "delete" if deleted else "upsert",
+            "id": doc["id"],
+            "project_id": doc["id"] if kind == "project" else doc.get("project_id"),
+            "sprint_id": doc["id"] if kind == "sprint" else doc.get("sprint_id"),
+            "data": None if deleted else jsonable_encoder(model(**doc)),
+        }
+
+    @staticmethod
+    def task_delete_event(tombstone: dict) -> dict:
+        return {
+            "type": "task",
+            "op": "delete",
+            "id": tombstone["id"],
+            "project_id": tombstone.get("project_id"),
+            "sprint_id": tombstone.get("sprint_id"),
+            "data": None,
+        }
+
+    async def _run(self):
+        try:
+            await self._watch()
+        except OperationFailure as e:
+            logger.info("Change streams unavailable (%s), polling for events instead", e)
+            await self._poll()
+
+    async def _watch(self):
+        pipeline = [{"$match": {
+            "ns.coll": {"$in": list(EVENT_SOURCES) + ["task_tombstones"]},
+            "operationType": {"$in": ["insert", "update", "replace"]},
+        }}]
+        resume_token = None
+        while True:
+            try:
+                async with db.watch(pipeline, full_document="updateLookup", resume_after=resume_token) as stream:
+                    self.mode = "change_stream"
+                    async for change in stream:
+                        resume_token = stream.resume_token
+                        collection_name, doc = change["ns"]["coll"], change.get("fullDocument")
+                        if not doc:
+                            continue
+                        if collection_name == "task_tombstones":
+                            self.publish(self.task_delete_event(doc))
+                        else:
+                            self.publish(self.upsert_event(collection_name, doc))
+            except OperationFailure:
+                if self.mode != "change_stream":
+                    raise
+                logger.warning("Change stream interrupted, resuming", exc_info=True)
+                await asyncio.sleep(1)
+            except PyMongoError:
+                logger.warning("Change stream connection error, retrying", exc_info=True)
+                await asyncio.sleep(1)
+
+    async def _poll(self):
+        self.mode = "polling"
+        watermarks = {name: datetime.utcnow() for name in list(EVENT_SOURCES) + ["task_tombstones"]}
+        while True:
+            await asyncio.sleep(EVENTS_POLL_SECONDS)
+            if not self.subscribers:
+                watermarks = {name: datetime.utcnow() for name in watermarks}
+                continue
+            try:
+                for collection_name in EVENT_SOURCES:
+                    query = {"updated_date": {"$gt": watermarks[collection_name]}}
+                    async for doc in db[collection_name].find(query).sort("updated_date", ASCENDING):
+                        watermarks[collection_name] = doc["updated_date"]
+                        self.publish(self.upsert_event(collection_name, doc))
+                query = {"deleted_date": {"$gt": watermarks["task_tombstones"]}}
+                async for doc in db.task_tombstones.find(query).sort("deleted_date", ASCENDING):
+                    watermarks["task_tombstones"] = doc["deleted_date"]
+                    self.publish(self.task_delete_event(doc))
+            except PyMongoError:
+                logger.warning("Event polling failed, retrying", exc_info=True)
+
+    def stats(self) -> dict:
+        return {
+            "mode": self.mode,
+            "subscribers": len(self.subscribers),
+            "published": self.published,
+            "queued": sum(subscriber.queue.qsize() for subscriber in self.subscribers),
+            "dropped": sum(subscriber.dropped for subscriber in self.subscribers),
+        }
+
+broadcaster = ChangeBroadcaster()
+
+@api_router.get("/events")
+async def stream_events(project_id: Optional[str] = None, sprint_id: Optional[str] = None):
+    subscriber = broadcaster.subscribe(project_id, sprint_id)
+
+    async def messages():
+        try:
+            yield sse_message("ready", {"project_id": project_id, "sprint_id": sprint_id})
+            while True:
+                try:
+                    yield await asyncio.wait_for(subscriber.queue.get(), EVENTS_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+        finally:
+            broadcaster.unsubscribe(subscriber)
+
+    return StreamingResponse(
+        messages(), media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@api_router.get("/events/stats")
+async def get_event_stats():
+    return broadcaster.stats()
+
+# Database pool statistics
+@api_router.get("/db/pool")
+async def get_pool_stats():
+    options = client.delegate.options
+    return {
+        "max_pool_size": options.pool_options.max_pool_size,
+        "min_pool_size": options.pool_options.min_pool_size,
+        "read_preference": options.read_preference.mongos_mode,
+        "reporting_read_preference": reporting_db.read_preference.mongos_mode,
+        "servers": pool_stats.stats(options.pool_options.max_pool_size),
+    }
+
+# Cache statistics
+@api_router.get("/cache/stats")
+async def get_cache_stats():
+    return {cache.name: cache.stats() for cache in (project_cache, sprint_cache, occurrence_cache)}
 
 # Health check
+HEALTH_PING_TIMEOUT_SECONDS = float(os.environ.get('HEALTH_PING_TIMEOUT_SECONDS', '2'))
+
 @api_router.get("/health")
-async def health_check():
-    return {"status": "healthy", "timestamp": datetime.utcnow()}
+async def health_check(response: Response):
+    started = monotonic()
+    try:
+        await asyncio.wait_for(db.command("ping"), HEALTH_PING_TIMEOUT_SECONDS)
+        database = {"status": "ok", "ping_ms": round((monotonic() - started) * 1000, 2)}
+    except (PyMongoError, asyncio.TimeoutError) as e:
+        response.status_code = 503
+        return {
+            "status": "unhealthy",
+            "timestamp": datetime.utcnow(),
+            "database": {"status": "unreachable", "error": str(e) or type(e).__name__},
+        }
+    return {"status": "healthy", "timestamp": datetime.utcnow(), "database": database}
+
+# HTTP compression and caching
+# Responses above a size threshold are compressed with the best encoding the client
+# accepts (brotli when the optional brotli package is installed, else gzip). Streamed
+# bodies are flushed chunk by chunk so NDJSON exports still arrive incrementally;
+# server-sent events are left alone. Cache-Control is set per route prefix for GETs.
+COMPRESSION_MINIMUM_SIZE = int(os.environ.get('COMPRESSION_MINIMUM_SIZE', '1024'))
+GZIP_COMPRESS_LEVEL = int(os.environ.get('GZIP_COMPRESS_LEVEL', '6'))
+BROTLI_QUALITY = int(os.environ.get('BROTLI_QUALITY', '5'))
+COMPRESSION_ENCODINGS = [
+    encoding.strip() for encoding in os.environ.get('COMPRESSION_ENCODINGS', 'br,gzip').split(',')
+    if encoding.strip() == "gzip" or (encoding.strip() == "br" and brotli is not None)
+]
+UNCOMPRESSED_MEDIA_TYPES = ("text/event-stream",)
+# First matching prefix wins. no-cache still lets clients keep a copy and revalidate it
+# with the ETag. Projects and sprints embed task counters that change with every task
+# write, so they are revalidated like everything else.
+CACHE_CONTROL_POLICIES = [
+    ("/api/events", "no-store"),
+    ("/api/jobs/", "no-store"),
+    ("/api/", "private, no-cache"),
+]
+
+def accepted_encoding(accept_encoding: str) -> Optional[str]:
+    accepted = set()
+    for part in accept_encoding.lower().split(","):
+        coding, _, params = part.strip().partition(";")
+        if params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            accepted.add(coding.strip())
+    return next((encoding for encoding in COMPRESSION_ENCODINGS if encoding in accepted or "*" in accepted), None)
+
+class StreamCompressor:
+    def __init__(self, encoding: str):
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=BROTLI_QUALITY)
+        else:
+            self._brotli = None
+            self._zlib = zlib.compressobj(GZIP_COMPRESS_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        if self._brotli:
+            return self._brotli.process(data) + (self._brotli.finish() if final else self._brotli.flush())
+        return self._zlib.compress(data) + self._zlib.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+class CompressionMiddleware:
+    def __init__(self, app, minimum_size: int = COMPRESSION_MINIMUM_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        encoding = accepted_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        start = None
+        compressor: Optional[StreamCompressor] = None
+        passthrough = False
+
+        async def send_compressed(message):
+            nonlocal start, compressor, passthrough
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                return await send(message)
+            body, more_body = message.get("body", b""), message.get("more_body", False)
+            if compressor is None:
+                headers = MutableHeaders(scope=start)
+                media_type = headers.get("content-type", "").split(";")[0].strip()
+                if ("content-encoding" in headers or media_type in UNCOMPRESSED_MEDIA_TYPES
+                        or (not more_body and len(body) < self.minimum_size)):
+                    passthrough = True
+                    await send(start)
+                    return await send(message)
+                headers.add_vary_header("Accept-Encoding")
+                if encoding is None:
+                    passthrough = True
+                    await send(start)
+                    return await send(message)
+                compressor = StreamCompressor(encoding)
+                headers["Content-Encoding"] = encoding
+                # The encoded bytes differ from the identity ones, so a strong ETag is weakened
+                etag = headers.get("etag")
+                if etag and not etag.startswith("W/"):
+                    headers["ETag"] = f"W/{etag}"
+                del headers["content-length"]
+                if not more_body:
+                    body = compressor.compress(body, final=True)
+                    headers["Content-Length"] = str(len(body))
+                    await send(start)
+                    return await send({"type": "http.response.body", "body": body})
+                await send(start)
+            await send({
+                "type": "http.response.body",
+                "body": compressor.compress(body, final=not more_body),
+                "more_body": more_body,
+            })
+
+        await self.app(scope, receive, send_compressed)
+
+class CacheControlMiddleware:
+    def __init__(self, app, policies=CACHE_CONTROL_POLICIES):
+        self.app = app
+        self.policies = policies
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in ("GET", "HEAD"):
+            return await self.app(scope, receive, send)
+        policy = next((value for prefix, value in self.policies if scope["path"].startswith(prefix)), None)
+
+        async def send_with_policy(message):
+            if message["type"] == "http.response.start" and policy and message["status"] in (200, 304):
+                headers = MutableHeaders(scope=message)
+                headers.setdefault("Cache-Control", policy)
+            await send(message)
+
+        await self.app(scope, receive, send_with_policy)
+
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        status = 500
+        started = monotonic()
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        http_requests_in_flight.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            http_requests_in_flight.dec()
+            # Label by route template, not raw path, to keep the series count bounded
+            route = scope.get("route")
+            http_request_duration.observe(
+                monotonic() - started,
+                method=scope["method"],
+                route=getattr(route, "path", "unmatched"),
+                status=str(status),
+            )
+
+def cache_metric(field: str) -> Callable[[], dict]:
+    return lambda: {(("cache", cache.name),): cache.stats()[field] for cache in (project_cache, sprint_cache, occurrence_cache)}
+
+def pool_metric(field: str) -> Callable[[], dict]:
+    max_pool_size = client.delegate.options.pool_options.max_pool_size
+    return lambda: {(("server", server),): stats[field] for server, stats in pool_stats.stats(max_pool_size).items()}
+
+for field, description in (("hits", "Read cache hits."), ("misses", "Read cache misses."),
+                           ("evictions", "Read cache LRU evictions.")):
+    metrics.register(Counter(f"read_cache_{field}_total", description, cache_metric(field)))
+metrics.register(Gauge("read_cache_hit_ratio", "Read cache hit ratio since start.", cache_metric("hit_rate")))
+metrics.register(Gauge("read_cache_entries", "Entries held in the read cache.", cache_metric("entries")))
+metrics.register(Gauge("mongodb_pool_connections_open", "Open pooled connections.", pool_metric("open")))
+metrics.register(Gauge("mongodb_pool_connections_in_use", "Checked-out pooled connections.", pool_metric("in_use")))
+metrics.register(Gauge("mongodb_pool_wait_queue", "Operations waiting for a pooled connection.", pool_metric("waiting")))
+
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    return Response(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
 
 # Include the router in the main app
 app.include_router(api_router)
@@ -329,7 +3464,11 @@ app.add_middleware(
     allow_origins=["*"],
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag"],
 )
+app.add_middleware(CacheControlMiddleware)
+app.add_middleware(CompressionMiddleware)
+app.add_middleware(MetricsMiddleware)
 
 # Configure logging
 logging.basicConfig(
@@ -338,6 +3477,25 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+@app.on_event("startup")
+async def startup_ensure_indexes():
+    await ensure_indexes()
+    # First start with day summaries: build them from the existing tasks, once, in the job runner
+    if await db.day_summaries.estimated_document_count() == 0 and await db.tasks.estimated_document_count() > 0:
+        await queue_job("day_summaries_rebuild")
+
+@app.on_event("startup")
+async def start_background_tasks():
+    await queue_date_migration()
+    await queue_counter_reconciliation()
+    await queue_priority_rank_backfill()
+    # The job runner also resumes jobs left unfinished by a previous process
+    job_runner.start()
+    task_event_log.start()
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    await job_runner.stop()
+    await broadcaster.stop()
+    await task_event_log.stop()
     client.close()
\ No newline at end of file
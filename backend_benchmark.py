@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""Load-test the /api endpoints in-process and compare against saved baselines.
+
+The app is driven through httpx's ASGI transport, so no server or network is involved.
+Data lives in an in-memory mongomock-motor database unless --mongo-url points at a real
+(scratch) MongoDB. Numbers from the in-memory database mostly reflect the API's own
+overhead; use a real MongoDB for query-level comparisons.
+
+    python backend_benchmark.py --tasks 20000 --concurrency 16 --save baseline.json
+    python backend_benchmark.py --tasks 20000 --concurrency 16 --compare baseline.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta
+
+import numpy as np
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+SCENARIOS = ("get_tasks", "get_week_calendar", "update_task", "project_delete")
+# A comparison fails when p95 latency rises, or throughput drops, by more than this
+DEFAULT_TOLERANCE = 0.25
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mongo-url", help="Benchmark against this MongoDB instead of an in-memory database")
+    parser.add_argument("--db-name", default="task_benchmark", help="Database to seed (dropped first!)")
+    parser.add_argument("--projects", type=int, default=10)
+    parser.add_argument("--sprints", type=int, default=4, help="Sprints per project")
+    parser.add_argument("--tasks", type=int, default=5000, help="Tasks spread across the projects")
+    parser.add_argument("--delete-projects", type=int, default=5, help="Extra projects seeded for the delete scenario")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--alloc-samples", type=int, default=20, help="Sequential requests traced for allocations")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="Comma-separated subset of %s" % ", ".join(SCENARIOS))
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--save", metavar="PATH", help="Write the results as a JSON baseline")
+    parser.add_argument("--compare", metavar="PATH", help="Fail if results regress against this baseline")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    return parser.parse_args()
+
+def load_server(args):
+    """Import the backend with the chosen database wired in."""
+    os.environ["MONGO_URL"] = args.mongo_url or os.environ.get("MONGO_URL", "mongodb://localhost:27017")
+    os.environ["DB_NAME"] = args.db_name
+    sys.path.insert(0, os.path.join(ROOT_DIR, "backend"))
+    import server
+    if not args.mongo_url:
+        try:
+            from mongomock_motor import AsyncMongoMockClient
+        except ImportError:
+            sys.exit("mongomock-motor is not installed; install it or pass --mongo-url")
+        server.db = server.reporting_db = AsyncMongoMockClient()[args.db_name]
+    return server
+
+async def seed(server, args, rng):
+    """Insert projects, sprints and tasks directly, bypassing the API."""
+    db = server.db
+    for name in await db.list_collection_names():
+        await db.drop_collection(name)
+    today = date.today()
+    projects = [server.Project(name=f"Project {i}") for i in range(args.projects + args.delete_projects)]
+    await db.projects.insert_many([project.dict() for project in projects])
+    sprints = {}
+    for project in projects:
+        sprints[project.id] = [
+            server.Sprint(
+                name=f"Sprint {i}", project_id=project.id,
+                start_date=today + timedelta(days=14 * (i - args.sprints // 2)),
+                end_date=today + timedelta(days=14 * (i - args.sprints // 2) + 13),
+            )
+            for i in range(args.sprints)
+        ]
+        if sprints[project.id]:
+            await db.sprints.insert_many([sprint.dict() for sprint in sprints[project.id]])
+    # Delete-scenario projects get the same per-project task volume as the others
+    per_project = max(1, args.tasks // max(1, args.projects))
+    total_tasks = args.tasks + per_project * args.delete_projects
+    batch = []
+    for i in range(total_tasks):
+        project = projects[i % args.projects] if i < args.tasks else projects[args.projects + (i - args.tasks) % args.delete_projects]
+        sprint = rng.choice(sprints[project.id]) if sprints[project.id] and rng.random() < 0.7 else None
+        task = server.Task(
+            title=f"Task {i} {rng.choice(['fix', 'build', 'review', 'deploy', 'design'])} {rng.choice(['login', 'board', 'api', 'calendar'])}",
+            description="Benchmark task " * rng.randint(1, 20),
+            status=rng.choice(list(server.TaskStatus)),
+            priority=rng.choice(list(server.TaskPriority)),
+            project_id=project.id,
+            sprint_id=sprint.id if sprint else None,
+            assigned_to=rng.choice([None, "ana", "bob", "chen", "dara"]),
+            due_date=today + timedelta(days=rng.randint(-30, 60)) if rng.random() < 0.8 else None,
+            story_points=rng.choice([None, 1, 2, 3, 5, 8]),
+        )
+        batch.append(server.task_document(task))
+        if len(batch) >= 1000:
+            await db.tasks.insert_many(batch)
+            batch = []
+    if batch:
+        await db.tasks.insert_many(batch)
+    await server.rebuild_day_summaries()
+    task_ids = [doc["id"] async for doc in db.tasks.find(
+        {"project_id": {"$in": [project.id for project in projects[:args.projects]]}}, {"_id": 0, "id": 1}
+    )]
+    return projects[:args.projects], projects[args.projects:], task_ids
+
+def scenario_requests(name, rng, projects, delete_projects, task_ids):
+    """Return an async callable making one request of the scenario, or None if it has no work."""
+    today = date.today()
+    if name == "get_tasks":
+        async def request(client):
+            project = rng.choice(projects)
+            return await client.get("/api/tasks", params={"project_id": project.id})
+    elif name == "get_week_calendar":
+        async def request(client):
+            start = today + timedelta(days=rng.randint(-28, 49))
+            return await client.get("/api/calendar/week", params={"start_date": start.isoformat()})
+    elif name == "update_task":
+        if not task_ids:
+            return None
+
+        async def request(client):
+            return await client.put(f"/api/tasks/{rng.choice(task_ids)}", json={
+                "status": rng.choice(["todo", "in_progress", "review", "done"]),
+                "priority": rng.choice(["low", "medium", "high", "urgent"]),
+            })
+    elif name == "project_delete":
+        pending = list(delete_projects)
+
+        async def request(client):
+            # Measures the whole cascade: the 202 plus polling the job until it finishes
+            response = await client.delete(f"/api/projects/{pending.pop().id}")
+            if response.status_code != 202:
+                return response
+            job_url = f"/api/jobs/{response.json()['job_id']}"
+            while True:
+                response = await client.get(job_url)
+                if response.status_code != 200 or response.json()["status"] in ("completed", "failed"):
+                    return response
+                await asyncio.sleep(0.005)
+
+        request.limit = len(pending)
+    else:
+        sys.exit(f"Unknown scenario {name!r}; choose from {', '.join(SCENARIOS)}")
+    return request
+
+async def run_load(client, request, total, concurrency):
+    latencies, errors = [], 0
+    remaining = total
+
+    async def worker():
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            started = time.perf_counter()
+            response = await request(client)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(min(concurrency, total))))
+    return latencies, errors, time.perf_counter() - started
+
+async def trace_allocations(client, request, samples):
+    """Peak traced memory per request (KiB), measured sequentially under tracemalloc."""
+    peaks = []
+    tracemalloc.start()
+    try:
+        for _ in range(samples):
+            baseline = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            await request(client)
+            peaks.append((tracemalloc.get_traced_memory()[1] - baseline) / 1024)
+    finally:
+        tracemalloc.stop()
+    return peaks
+
+def summarize(latencies, errors, elapsed, peaks):
+    values = np.array(latencies) * 1000
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / elapsed, 2),
+        "mean_ms": round(float(values.mean()), 3),
+        "p50_ms": round(float(p50), 3),
+        "p95_ms": round(float(p95), 3),
+        "p99_ms": round(float(p99), 3),
+        "max_ms": round(float(values.max()), 3),
+        "peak_alloc_kib": round(float(np.median(peaks)), 1) if peaks else None,
+    }
+
+def compare(results, baseline, tolerance):
+    """Return the regressions of results against a saved baseline."""
+    regressions = []
+    for name, current in results.items():
+        previous = baseline["results"].get(name)
+        if not previous:
+            continue
+        if current["p95_ms"] > previous["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {previous['p95_ms']}ms -> {current['p95_ms']}ms")
+        if current["throughput_rps"] < previous["throughput_rps"] * (1 - tolerance):
+            regressions.append(f"{name}: throughput {previous['throughput_rps']} -> {current['throughput_rps']} req/s")
+        if current["errors"] > previous["errors"]:
+            regressions.append(f"{name}: errors {previous['errors']} -> {current['errors']}")
+    return regressions
+
+def print_results(results):
+    columns = ("requests", "errors", "throughput_rps", "p50_ms", "p95_ms", "p99_ms", "max_ms", "peak_alloc_kib")
+    print(f"{'scenario':<20}" + "".join(f"{column:>16}" for column in columns))
+    for name, result in results.items():
+        print(f"{name:<20}" + "".join(f"{str(result[column]):>16}" for column in columns))
+
+async def main():
+    args = parse_args()
+    import httpx
+    import logging
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    server = load_server(args)
+    logging.getLogger("server").setLevel(logging.WARNING)
+    rng = random.Random(args.seed)
+    config = {key: value for key, value in vars(args).items() if key not in ("save", "compare", "tolerance")}
+    config["database"] = "mongodb" if args.mongo_url else "mongomock"
+
+    print(f"Seeding {args.projects} projects, {args.sprints} sprints each and {args.tasks} tasks...")
+    projects, delete_projects, task_ids = await seed(server, args, rng)
+    for handler in server.app.router.on_startup:
+        await handler()
+    results = {}
+    transport = httpx.ASGITransport(app=server.app)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=None) as client:
+            for name in [name.strip() for name in args.scenarios.split(",") if name.strip()]:
+                request = scenario_requests(name, rng, projects, delete_projects, task_ids)
+                total = min(args.requests, getattr(request, "limit", args.requests)) if request else 0
+                if not total:
+                    print(f"Skipping {name}: nothing to run")
+                    continue
+                # The delete scenario consumes its projects, so it gets no warm-up or allocation pass
+                repeatable = name != "project_delete"
+                if repeatable:
+                    await run_load(client, request, min(5, total), 1)
+                print(f"Running {name}: {total} requests at concurrency {args.concurrency}")
+                latencies, errors, elapsed = await run_load(client, request, total, args.concurrency)
+                peaks = await trace_allocations(client, request, args.alloc_samples if repeatable else 0)
+                results[name] = summarize(latencies, errors, elapsed, peaks)
+    finally:
+        for handler in server.app.router.on_shutdown:
+            await handler()
+
+    print()
+    print_results(results)
+    report = {
+        "created": datetime.utcnow().isoformat(),
+        "python": platform.python_version(),
+        "config": config,
+        "results": results,
+    }
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nSaved baseline to {args.save}")
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if baseline.get("config") != config:
+            print("\nWarning: baseline was recorded with a different configuration")
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\nREGRESSIONS (tolerance {args.tolerance:.0%}):")
+            for regression in regressions:
+                print(f"  - {regression}")
+            return False
+        print(f"\nNo regressions against {args.compare} (tolerance {args.tolerance:.0%})")
+    return True
+
+if __name__ == "__main__":
+    success = asyncio.run(main())
+    sys.exit(0 if success else 1)
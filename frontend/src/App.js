@@ -5,6 +5,18 @@ import axios from 'axios';
 const BACKEND_URL = process.env.REACT_APP_BACKEND_URL;
 const API = `${BACKEND_URL}/api`;
 
+// List endpoints return one page at a time; follow X-Next-Cursor until the last page
+const getAllPages = async (url) => {
+  const rows = [];
+  let after = null;
+  do {
+    const response = await axios.get(url, { params: after ? { after } : {} });
+    rows.push(...response.data);
+    after = response.headers['x-next-cursor'];
+  } while (after);
+  return rows;
+};
+
 // Utility functions
 const formatDate = (date) => {
   // Handle date string properly to avoid timezone issues
@@ -768,8 +780,7 @@ function App() {
   // Fetch data
   const fetchTasks = async () => {
     try {
-      const response = await axios.get(`${API}/tasks`);
-      setTasks(response.data);
+      setTasks(await getAllPages(`${API}/tasks`));
     } catch (error) {
       console.error('Error fetching tasks:', error);
     }
@@ -777,8 +788,7 @@ function App() {
 
   const fetchProjects = async () => {
     try {
-      const response = await axios.get(`${API}/projects`);
-      setProjects(response.data);
+      setProjects(await getAllPages(`${API}/projects`));
     } catch (error) {
       console.error('Error fetching projects:', error);
     }
@@ -786,8 +796,7 @@ function App() {
 
   const fetchSprints = async () => {
     try {
-      const response = await axios.get(`${API}/sprints`);
-      setSprints(response.data);
+      setSprints(await getAllPages(`${API}/sprints`));
     } catch (error) {
       console.error('Error fetching sprints:', error);
     }